@@ -0,0 +1,35 @@
+"""
+Gunicorn settings for serving the web dashboard.
+
+Run from the project root, where gunicorn picks this file up automatically:
+
+    gunicorn src.web.app:app
+
+Threaded workers are used rather than gevent: sqlite3 queries run in C and
+would not yield to other greenlets, and the async views already hand their
+blocking work to threads. Under WAL, readers in one worker are not held up
+by a quality check writing from another.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import config
+
+bind = f"{config.web_host}:{config.web_port}"
+
+# Two processes, each serving several requests at once
+workers = 2
+worker_class = 'gthread'
+threads = 4
+
+# Keep connections open between dashboard page loads
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """Compile the quality check kernels before the worker takes requests."""
+    from src.data_quality import warm_up
+    warm_up()
@@ -4,7 +4,9 @@ and save it to the data directory.
 """
 
 import os
-import pandas as pd
+import sys
+import urllib.request
+from itertools import islice
 from pathlib import Path
 
 def download_dataset():
@@ -17,18 +19,25 @@ def download_dataset():
     url = "https://raw.githubusercontent.com/stedy/Machine-Learning-with-R-datasets/master/insurance.csv"
     
     try:
-        # Download and save the dataset
-        df = pd.read_csv(url)
+        # Stream the dataset straight to disk without parsing it
         output_path = data_dir / "insurance.csv"
-        df.to_csv(output_path, index=False)
+        urllib.request.urlretrieve(url, output_path)
         print(f"Dataset downloaded successfully to {output_path}")
-        print(f"Shape: {df.shape}")
-        print("\nSample data:")
-        print(df.head())
+        
+        # Preview the file only for interactive runs, reading raw lines
+        # instead of parsing the CSV
+        if sys.stdout.isatty():
+            with open(output_path) as f:
+                header = next(f).rstrip('\n')
+                sample = [line.rstrip('\n') for line in islice(f, 5)]
+                num_rows = len(sample) + sum(1 for _ in f)
+            print(f"Shape: {(num_rows, len(header.split(',')))}")
+            print("\nSample data:")
+            print('\n'.join([header] + sample))
         
     except Exception as e:
         print(f"Error downloading dataset: {e}")
         raise
 
 if __name__ == "__main__":
-    download_dataset()
\ No newline at end of file
+    download_dataset()
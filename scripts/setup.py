@@ -13,8 +13,8 @@ import sqlite3
 import pandas as pd
 import numpy as np
 from faker import Faker
-import random
-from datetime import datetime, timedelta
+from joblib import Parallel, delayed
+from datetime import datetime
 
 # Add the src directory to the path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -22,301 +22,351 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # Create database directory if it doesn't exist
 os.makedirs('data/db', exist_ok=True)
 
+# Connection settings for the sample data load: WAL avoids a sync per commit
+# and the larger page cache keeps the B-tree inserts in memory
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'cache_size=-65536',
+    'temp_store=MEMORY',
+    'mmap_size=268435456'
+)
+
+# Schema for the synthetic healthcare tables
+SCHEMA_DDL = '''
+CREATE TABLE IF NOT EXISTS patients (
+    patient_id TEXT PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    date_of_birth DATE,
+    gender TEXT,
+    address TEXT,
+    city TEXT,
+    state TEXT,
+    zip_code TEXT,
+    phone_number TEXT,
+    email TEXT,
+    insurance_provider TEXT,
+    insurance_id TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS encounters (
+    encounter_id TEXT PRIMARY KEY,
+    patient_id TEXT,
+    provider_id TEXT,
+    encounter_date DATE,
+    encounter_type TEXT,
+    reason TEXT,
+    diagnosis_codes TEXT,
+    procedure_codes TEXT,
+    medications TEXT,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (patient_id) REFERENCES patients (patient_id)
+);
+
+CREATE TABLE IF NOT EXISTS providers (
+    provider_id TEXT PRIMARY KEY,
+    first_name TEXT,
+    last_name TEXT,
+    specialty TEXT,
+    npi_number TEXT,
+    facility_id TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS facilities (
+    facility_id TEXT PRIMARY KEY,
+    name TEXT,
+    address TEXT,
+    city TEXT,
+    state TEXT,
+    zip_code TEXT,
+    phone_number TEXT,
+    type TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS lab_results (
+    result_id TEXT PRIMARY KEY,
+    patient_id TEXT,
+    encounter_id TEXT,
+    test_name TEXT,
+    test_code TEXT,
+    result_value TEXT,
+    result_unit TEXT,
+    reference_range TEXT,
+    abnormal_flag TEXT,
+    result_date DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (patient_id) REFERENCES patients (patient_id),
+    FOREIGN KEY (encounter_id) REFERENCES encounters (encounter_id)
+);
+'''
+
+# Reference values used to generate synthetic encounters
+ENCOUNTER_TYPES = ['Office Visit', 'Emergency', 'Inpatient', 'Outpatient', 'Telehealth', 'Home Health']
+REASONS = ['Annual Physical', 'Illness', 'Follow-up', 'Chronic Disease Management', 'Preventive Care', 'Injury']
+DIAGNOSIS_CODES = ['E11.9', 'I10', 'J45.909', 'F41.1', 'M54.5', 'K21.9', 'G43.909', 'N39.0', 'L40.0', 'H60.339']
+PROCEDURE_CODES = ['99213', '99214', '99215', '99396', '99397', '99203', '99204', '99205', '99285', '99284']
+MEDICATIONS = ['Lisinopril', 'Metformin', 'Atorvastatin', 'Levothyroxine', 'Albuterol', 'Omeprazole', 
+               'Amlodipine', 'Metoprolol', 'Gabapentin', 'Sertraline']
+
+def get_db_connection():
+    """Open the sample database with the bulk-load connection settings."""
+    conn = sqlite3.connect('data/db/healthcare.db')
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(f'PRAGMA {pragma}')
+    return conn
+
 def create_database():
     """Create SQLite database with tables for healthcare data"""
     print("Creating database...")
     
     # Connect to SQLite database (will be created if it doesn't exist)
-    conn = sqlite3.connect('data/db/healthcare.db')
-    cursor = conn.cursor()
-    
-    # Create patients table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS patients (
-        patient_id TEXT PRIMARY KEY,
-        first_name TEXT,
-        last_name TEXT,
-        date_of_birth DATE,
-        gender TEXT,
-        address TEXT,
-        city TEXT,
-        state TEXT,
-        zip_code TEXT,
-        phone_number TEXT,
-        email TEXT,
-        insurance_provider TEXT,
-        insurance_id TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Create encounters table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS encounters (
-        encounter_id TEXT PRIMARY KEY,
-        patient_id TEXT,
-        provider_id TEXT,
-        encounter_date DATE,
-        encounter_type TEXT,
-        reason TEXT,
-        diagnosis_codes TEXT,
-        procedure_codes TEXT,
-        medications TEXT,
-        notes TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (patient_id) REFERENCES patients (patient_id)
-    )
-    ''')
-    
-    # Create providers table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS providers (
-        provider_id TEXT PRIMARY KEY,
-        first_name TEXT,
-        last_name TEXT,
-        specialty TEXT,
-        npi_number TEXT,
-        facility_id TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Create facilities table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS facilities (
-        facility_id TEXT PRIMARY KEY,
-        name TEXT,
-        address TEXT,
-        city TEXT,
-        state TEXT,
-        zip_code TEXT,
-        phone_number TEXT,
-        type TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Create lab_results table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS lab_results (
-        result_id TEXT PRIMARY KEY,
-        patient_id TEXT,
-        encounter_id TEXT,
-        test_name TEXT,
-        test_code TEXT,
-        result_value TEXT,
-        result_unit TEXT,
-        reference_range TEXT,
-        abnormal_flag TEXT,
-        result_date DATE,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (patient_id) REFERENCES patients (patient_id),
-        FOREIGN KEY (encounter_id) REFERENCES encounters (encounter_id)
-    )
-    ''')
+    conn = get_db_connection()
     
+    # Create all tables in a single batch
+    conn.executescript(SCHEMA_DDL)
     conn.commit()
     conn.close()
     print("Database created successfully!")
 
+def sample_code_lists(rng, codes, counts):
+    """Join a random sample of ``counts[i]`` distinct codes for each row."""
+    codes = np.asarray(codes)
+    order = np.argsort(rng.random((len(counts), len(codes))), axis=1)
+    return [','.join(codes[row[:count]]) for row, count in zip(order, counts)]
+
+def generate_encounter_chunk(seed, start, encounter_dates, patient_ids, provider_ids):
+    """Generate a chunk of synthetic encounters.
+    
+    Each chunk uses its own Faker instance and numpy generator seeded from
+    ``seed`` so chunks can be generated in parallel worker processes. The
+    random fields are drawn a whole column at a time.
+    """
+    fake = Faker()
+    fake.seed_instance(seed)
+    rng = np.random.default_rng(seed)
+    num_encounters = len(encounter_dates)
+    
+    # Generate random number of diagnoses, procedures, and medications
+    num_diagnoses = rng.integers(1, 4, num_encounters)
+    num_procedures = rng.integers(1, 3, num_encounters)
+    num_meds = rng.integers(0, 4, num_encounters)
+    
+    columns = zip(
+        rng.choice(patient_ids, num_encounters).tolist(),
+        rng.choice(provider_ids, num_encounters).tolist(),
+        encounter_dates,
+        rng.choice(ENCOUNTER_TYPES, num_encounters).tolist(),
+        rng.choice(REASONS, num_encounters).tolist(),
+        sample_code_lists(rng, DIAGNOSIS_CODES, num_diagnoses),
+        sample_code_lists(rng, PROCEDURE_CODES, num_procedures),
+        sample_code_lists(rng, MEDICATIONS, num_meds),
+        [fake.paragraph(nb_sentences=3) for _ in range(num_encounters)]
+    )
+    
+    return [
+        {
+            'encounter_id': f"ENC{start+offset+1:08d}",
+            'patient_id': patient_id,
+            'provider_id': provider_id,
+            'encounter_date': encounter_date,
+            'encounter_type': encounter_type,
+            'reason': reason,
+            'diagnosis_codes': diagnosis_codes,
+            'procedure_codes': procedure_codes,
+            'medications': medications,
+            'notes': notes
+        }
+        for offset, (patient_id, provider_id, encounter_date, encounter_type, reason,
+                     diagnosis_codes, procedure_codes, medications, notes) in enumerate(columns)
+    ]
+
 def generate_sample_data():
     """Generate synthetic healthcare data for testing"""
     print("Generating sample data...")
     
     fake = Faker()
     Faker.seed(42)  # For reproducibility
-    random.seed(42)
     np.random.seed(42)
     
     # Connect to the database
-    conn = sqlite3.connect('data/db/healthcare.db')
+    conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Generate facilities data
-    facilities = []
+    # Generate facilities data column by column, drawing the categorical
+    # fields in a single random_elements call each
+    num_facilities = 10
     facility_types = ['Hospital', 'Clinic', 'Urgent Care', 'Laboratory', 'Imaging Center']
+    name_suffixes = fake.random_elements(
+        elements=('Hospital', 'Medical Center', 'Clinic', 'Care'), length=num_facilities, unique=False)
+    types = fake.random_elements(elements=tuple(facility_types), length=num_facilities, unique=False)
     
-    for i in range(10):
-        facility_id = f"FAC{i+1:04d}"
-        facilities.append({
-            'facility_id': facility_id,
-            'name': fake.company() + ' ' + random.choice(['Hospital', 'Medical Center', 'Clinic', 'Care']),
+    facilities = [
+        {
+            'facility_id': f"FAC{i+1:04d}",
+            'name': fake.company() + ' ' + name_suffixes[i],
             'address': fake.street_address(),
             'city': fake.city(),
             'state': fake.state_abbr(),
             'zip_code': fake.zipcode(),
             'phone_number': fake.phone_number(),
-            'type': random.choice(facility_types)
-        })
+            'type': types[i]
+        }
+        for i in range(num_facilities)
+    ]
     
     # Insert facilities data
-    for facility in facilities:
-        cursor.execute('''
+    cursor.executemany('''
         INSERT INTO facilities (facility_id, name, address, city, state, zip_code, phone_number, type)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            facility['facility_id'],
-            facility['name'],
-            facility['address'],
-            facility['city'],
-            facility['state'],
-            facility['zip_code'],
-            facility['phone_number'],
-            facility['type']
-        ))
+        VALUES (:facility_id, :name, :address, :city, :state, :zip_code, :phone_number, :type)
+        ''', facilities)
     
-    # Generate providers data
-    providers = []
+    # Generate providers data, sampling specialties, NPI numbers and
+    # facility assignments for all providers up front
+    num_providers = 50
     specialties = ['Family Medicine', 'Internal Medicine', 'Cardiology', 'Neurology', 'Orthopedics', 
                   'Pediatrics', 'Obstetrics', 'Gynecology', 'Psychiatry', 'Dermatology']
+    provider_specialties = fake.random_elements(
+        elements=tuple(specialties), length=num_providers, unique=False)
+    provider_facilities = fake.random_elements(
+        elements=tuple(f['facility_id'] for f in facilities), length=num_providers, unique=False)
+    npi_numbers = np.random.randint(1000000000, 10000000000, num_providers, dtype=np.int64)
     
-    for i in range(50):
-        provider_id = f"PRV{i+1:04d}"
-        providers.append({
-            'provider_id': provider_id,
+    providers = [
+        {
+            'provider_id': f"PRV{i+1:04d}",
             'first_name': fake.first_name(),
             'last_name': fake.last_name(),
-            'specialty': random.choice(specialties),
-            'npi_number': f"{random.randint(1000000000, 9999999999)}",
-            'facility_id': random.choice(facilities)['facility_id']
-        })
+            'specialty': provider_specialties[i],
+            'npi_number': str(npi_numbers[i]),
+            'facility_id': provider_facilities[i]
+        }
+        for i in range(num_providers)
+    ]
     
     # Insert providers data
-    for provider in providers:
-        cursor.execute('''
+    cursor.executemany('''
         INSERT INTO providers (provider_id, first_name, last_name, specialty, npi_number, facility_id)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            provider['provider_id'],
-            provider['first_name'],
-            provider['last_name'],
-            provider['specialty'],
-            provider['npi_number'],
-            provider['facility_id']
-        ))
+        VALUES (:provider_id, :first_name, :last_name, :specialty, :npi_number, :facility_id)
+        ''', providers)
     
-    # Generate patients data
-    patients = []
+    # Generate patients data column by column so each Faker provider and
+    # random draw is invoked in bulk rather than interleaved per patient
+    num_patients = 200
     genders = ['Male', 'Female', 'Other', 'Unknown']
     insurance_providers = ['Medicare', 'Medicaid', 'Blue Cross', 'Aetna', 'UnitedHealth', 'Cigna', 'Humana']
     
-    for i in range(200):
-        patient_id = f"PAT{i+1:06d}"
-        gender = random.choice(genders)
-        first_name = fake.first_name_male() if gender == 'Male' else fake.first_name_female() if gender == 'Female' else fake.first_name()
-        
-        # Generate a date of birth between 1940 and 2010
-        dob = fake.date_of_birth(minimum_age=10, maximum_age=80)
-        
-        patients.append({
-            'patient_id': patient_id,
+    patient_genders = np.random.choice(genders, num_patients)
+    is_male = patient_genders == 'Male'
+    is_female = patient_genders == 'Female'
+    is_other = ~(is_male | is_female)
+    first_names = np.empty(num_patients, dtype=object)
+    first_names[is_male] = [fake.first_name_male() for _ in range(np.count_nonzero(is_male))]
+    first_names[is_female] = [fake.first_name_female() for _ in range(np.count_nonzero(is_female))]
+    first_names[is_other] = [fake.first_name() for _ in range(np.count_nonzero(is_other))]
+    
+    # Generate dates of birth between 10 and 80 years ago
+    today = pd.Timestamp.now().normalize()
+    dob_days = np.random.randint(10 * 365, 80 * 365 + 1, num_patients)
+    dates_of_birth = (today - pd.to_timedelta(dob_days, unit='D')).strftime('%Y-%m-%d')
+    
+    patients = [
+        {
+            'patient_id': f"PAT{i+1:06d}",
             'first_name': first_name,
-            'last_name': fake.last_name(),
-            'date_of_birth': dob.strftime('%Y-%m-%d'),
+            'last_name': last_name,
+            'date_of_birth': dob,
             'gender': gender,
-            'address': fake.street_address(),
-            'city': fake.city(),
-            'state': fake.state_abbr(),
-            'zip_code': fake.zipcode(),
-            'phone_number': fake.phone_number(),
-            'email': fake.email(),
-            'insurance_provider': random.choice(insurance_providers),
-            'insurance_id': f"{random.randint(10000000, 99999999)}"
-        })
+            'address': address,
+            'city': city,
+            'state': state,
+            'zip_code': zip_code,
+            'phone_number': phone_number,
+            'email': email,
+            'insurance_provider': insurance_provider,
+            'insurance_id': str(insurance_id)
+        }
+        for i, (first_name, last_name, dob, gender, address, city, state, zip_code,
+                phone_number, email, insurance_provider, insurance_id) in enumerate(zip(
+            first_names.tolist(),
+            [fake.last_name() for _ in range(num_patients)],
+            dates_of_birth.tolist(),
+            patient_genders.tolist(),
+            [fake.street_address() for _ in range(num_patients)],
+            [fake.city() for _ in range(num_patients)],
+            [fake.state_abbr() for _ in range(num_patients)],
+            [fake.zipcode() for _ in range(num_patients)],
+            [fake.phone_number() for _ in range(num_patients)],
+            [fake.email() for _ in range(num_patients)],
+            np.random.choice(insurance_providers, num_patients).tolist(),
+            np.random.randint(10000000, 100000000, num_patients).tolist()
+        ))
+    ]
     
     # Insert patients data
-    for patient in patients:
-        cursor.execute('''
+    cursor.executemany('''
         INSERT INTO patients (
             patient_id, first_name, last_name, date_of_birth, gender, 
             address, city, state, zip_code, phone_number, 
             email, insurance_provider, insurance_id
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            patient['patient_id'],
-            patient['first_name'],
-            patient['last_name'],
-            patient['date_of_birth'],
-            patient['gender'],
-            patient['address'],
-            patient['city'],
-            patient['state'],
-            patient['zip_code'],
-            patient['phone_number'],
-            patient['email'],
-            patient['insurance_provider'],
-            patient['insurance_id']
-        ))
+        VALUES (
+            :patient_id, :first_name, :last_name, :date_of_birth,
+            :gender, :address, :city, :state,
+            :zip_code, :phone_number, :email, :insurance_provider,
+            :insurance_id
+        )
+        ''', patients)
     
     # Generate encounters data
-    encounters = []
-    encounter_types = ['Office Visit', 'Emergency', 'Inpatient', 'Outpatient', 'Telehealth', 'Home Health']
-    reasons = ['Annual Physical', 'Illness', 'Follow-up', 'Chronic Disease Management', 'Preventive Care', 'Injury']
-    diagnosis_codes = ['E11.9', 'I10', 'J45.909', 'F41.1', 'M54.5', 'K21.9', 'G43.909', 'N39.0', 'L40.0', 'H60.339']
-    procedure_codes = ['99213', '99214', '99215', '99396', '99397', '99203', '99204', '99205', '99285', '99284']
-    medications = ['Lisinopril', 'Metformin', 'Atorvastatin', 'Levothyroxine', 'Albuterol', 'Omeprazole', 
-                  'Amlodipine', 'Metoprolol', 'Gabapentin', 'Sertraline']
-    
-    # Current date for reference
     current_date = datetime.now()
     
-    for i in range(1000):
-        encounter_id = f"ENC{i+1:08d}"
-        patient = random.choice(patients)
-        provider = random.choice(providers)
-        
-        # Generate encounter date within the last 2 years
-        days_back = random.randint(1, 730)
-        encounter_date = (current_date - timedelta(days=days_back)).strftime('%Y-%m-%d')
-        
-        # Generate random number of diagnoses, procedures, and medications
-        num_diagnoses = random.randint(1, 3)
-        num_procedures = random.randint(1, 2)
-        num_meds = random.randint(0, 3)
-        
-        encounters.append({
-            'encounter_id': encounter_id,
-            'patient_id': patient['patient_id'],
-            'provider_id': provider['provider_id'],
-            'encounter_date': encounter_date,
-            'encounter_type': random.choice(encounter_types),
-            'reason': random.choice(reasons),
-            'diagnosis_codes': ','.join(random.sample(diagnosis_codes, num_diagnoses)),
-            'procedure_codes': ','.join(random.sample(procedure_codes, num_procedures)),
-            'medications': ','.join(random.sample(medications, num_meds)),
-            'notes': fake.paragraph(nb_sentences=3)
-        })
+    # Generate encounter dates within the last 2 years in one vectorized pass
+    num_encounters = 1000
+    days_back = np.random.randint(1, 731, num_encounters)
+    encounter_dates = (pd.Timestamp(current_date) - pd.to_timedelta(days_back, unit='D')).strftime('%Y-%m-%d').tolist()
+    
+    # Fan the Faker-heavy encounter generation out over worker processes;
+    # each chunk is seeded by its position so the output is reproducible
+    chunk_size = 100
+    patient_ids = [patient['patient_id'] for patient in patients]
+    provider_ids = [provider['provider_id'] for provider in providers]
+    chunks = Parallel(n_jobs=-1)(
+        delayed(generate_encounter_chunk)(
+            42 + start // chunk_size,
+            start,
+            encounter_dates[start:start + chunk_size],
+            patient_ids,
+            provider_ids
+        )
+        for start in range(0, num_encounters, chunk_size)
+    )
+    encounters = [encounter for chunk in chunks for encounter in chunk]
     
     # Insert encounters data
-    for encounter in encounters:
-        cursor.execute('''
+    cursor.executemany('''
         INSERT INTO encounters (
             encounter_id, patient_id, provider_id, encounter_date, 
             encounter_type, reason, diagnosis_codes, procedure_codes, 
             medications, notes
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            encounter['encounter_id'],
-            encounter['patient_id'],
-            encounter['provider_id'],
-            encounter['encounter_date'],
-            encounter['encounter_type'],
-            encounter['reason'],
-            encounter['diagnosis_codes'],
-            encounter['procedure_codes'],
-            encounter['medications'],
-            encounter['notes']
-        ))
+        VALUES (
+            :encounter_id, :patient_id, :provider_id, :encounter_date,
+            :encounter_type, :reason, :diagnosis_codes, :procedure_codes,
+            :medications, :notes
+        )
+        ''', encounters)
     
-    # Generate lab results data
-    lab_results = []
+    # Generate lab results data with whole columns drawn from one generator
     test_names = ['Complete Blood Count', 'Basic Metabolic Panel', 'Comprehensive Metabolic Panel', 
                  'Lipid Panel', 'Hemoglobin A1C', 'Thyroid Stimulating Hormone', 'Urinalysis',
                  'Liver Function Tests', 'Vitamin D', 'Prostate Specific Antigen']
@@ -324,63 +374,71 @@ def generate_sample_data():
     units = ['g/dL', 'mg/dL', 'U/L', 'mmol/L', '%', 'mIU/L', 'ng/mL', 'mcg/L']
     abnormal_flags = ['', '', '', 'H', 'L', '', '', '']  # More empty strings to make normal results more common
     
-    for i in range(2000):
-        result_id = f"LAB{i+1:08d}"
-        
-        # Select a random encounter
-        encounter = random.choice(encounters)
-        patient_id = encounter['patient_id']
-        encounter_id = encounter['encounter_id']
-        
-        # Select a random test
-        test_index = random.randint(0, len(test_names) - 1)
-        test_name = test_names[test_index]
-        test_code = test_codes[test_index]
-        
-        # Generate result date on or after encounter date
-        encounter_date = datetime.strptime(encounter['encounter_date'], '%Y-%m-%d')
-        days_after = random.randint(0, 5)  # Results typically come back within a few days
-        result_date = (encounter_date + timedelta(days=days_after)).strftime('%Y-%m-%d')
-        
-        # Generate result value and other details
-        result_value = str(round(random.uniform(1, 200), 1))
-        result_unit = random.choice(units)
-        reference_range = f"{round(random.uniform(1, 100), 1)}-{round(random.uniform(100, 200), 1)}"
-        abnormal_flag = random.choice(abnormal_flags)
-        
-        lab_results.append({
-            'result_id': result_id,
+    rng = np.random.default_rng(42)
+    num_results = 2000
+    
+    # Select a random encounter and test for each result
+    encounter_idx = rng.integers(0, len(encounters), num_results)
+    test_idx = rng.integers(0, len(test_names), num_results)
+    encounter_patient_ids = np.array([encounter['patient_id'] for encounter in encounters])
+    encounter_ids = np.array([encounter['encounter_id'] for encounter in encounters])
+    encounter_days = pd.to_datetime([encounter['encounter_date'] for encounter in encounters])
+    
+    # Generate result date on or after encounter date; results typically
+    # come back within a few days
+    days_after = rng.integers(0, 6, num_results)
+    result_dates = (encounter_days[encounter_idx] + pd.to_timedelta(days_after, unit='D')).strftime('%Y-%m-%d')
+    
+    # Generate result value and other details
+    result_values = np.round(rng.uniform(1, 200, num_results), 1)
+    range_lows = np.round(rng.uniform(1, 100, num_results), 1)
+    range_highs = np.round(rng.uniform(100, 200, num_results), 1)
+    
+    lab_results = [
+        {
+            'result_id': f"LAB{i+1:08d}",
             'patient_id': patient_id,
             'encounter_id': encounter_id,
-            'test_name': test_name,
-            'test_code': test_code,
-            'result_value': result_value,
+            'test_name': test_names[test_index],
+            'test_code': test_codes[test_index],
+            'result_value': str(result_value),
             'result_unit': result_unit,
-            'reference_range': reference_range,
+            'reference_range': f"{range_low}-{range_high}",
             'abnormal_flag': abnormal_flag,
             'result_date': result_date
-        })
+        }
+        for i, (patient_id, encounter_id, test_index, result_value, result_unit,
+                range_low, range_high, abnormal_flag, result_date) in enumerate(zip(
+            encounter_patient_ids[encounter_idx].tolist(),
+            encounter_ids[encounter_idx].tolist(),
+            test_idx.tolist(),
+            result_values.tolist(),
+            rng.choice(units, num_results).tolist(),
+            range_lows.tolist(),
+            range_highs.tolist(),
+            rng.choice(abnormal_flags, num_results).tolist(),
+            result_dates.tolist()
+        ))
+    ]
     
     # Insert lab results data
-    for result in lab_results:
-        cursor.execute('''
+    cursor.executemany('''
         INSERT INTO lab_results (
             result_id, patient_id, encounter_id, test_name, test_code,
             result_value, result_unit, reference_range, abnormal_flag, result_date
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            result['result_id'],
-            result['patient_id'],
-            result['encounter_id'],
-            result['test_name'],
-            result['test_code'],
-            result['result_value'],
-            result['result_unit'],
-            result['reference_range'],
-            result['abnormal_flag'],
-            result['result_date']
-        ))
+        VALUES (
+            :result_id, :patient_id, :encounter_id, :test_name,
+            :test_code, :result_value, :result_unit, :reference_range,
+            :abnormal_flag, :result_date
+        )
+        ''', lab_results)
+    
+    # Index the foreign keys once the data is loaded and refresh the
+    # planner statistics
+    cursor.execute('CREATE INDEX IF NOT EXISTS ix_encounters_patient ON encounters (patient_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS ix_lab_enc ON lab_results (encounter_id)')
+    cursor.execute('ANALYZE')
     
     # Commit changes and close connection
     conn.commit()
@@ -3,38 +3,249 @@
 API server for Healthcare Data QA Automation Framework.
 """
 
+import asyncio
 import os
 import sys
-import json
 import sqlite3
+import time
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template, send_from_directory
-from dotenv import load_dotenv
+from functools import lru_cache
+import numpy as np
+import orjson
+import pandas as pd
+from flask import Flask, Response, g, request, render_template, send_from_directory, stream_with_context
 
 # Add the src directory to the path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.data_quality import NullValueCheck, SchemaValidationCheck, StatisticalAnomalyCheck
-
-# Load environment variables
-load_dotenv()
+from src.config import config
+from src.data_quality.null_check import NullCheck
+from src.data_quality.schema_check import SchemaCheck
+from src.data_quality.anomaly_check import AnomalyCheck
+from src.data_quality.run_checks import ensure_indexes
 
 # Create Flask app
 app = Flask(__name__, template_folder='templates', static_folder='static')
 
-# Get database path from environment
-DB_PATH = os.getenv('DB_PATH', 'data/db/healthcare.db')
+# Get database path from the environment-backed config
+DB_PATH = config.db_path
+
+# Directory the quality check runner writes its result files to
+QUALITY_RESULTS_DIR = 'data/quality_results'
+
+# Connection settings applied once when a request first opens the database
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'cache_size=-65536'
+)
+
+# Number of rows fetched and serialized per chunk when streaming table data
+FETCH_CHUNK_SIZE = 1000
+
+# Seconds a table's row count is reused before COUNT(*) is run again
+COUNT_CACHE_TTL = 30.0
+
+# Expected pandas dtype for each SQLite column type the schema check accepts;
+# other declared types are checked for presence only
+SQL_TYPE_DTYPES = {
+    'INTEGER': np.integer,
+    'REAL': np.floating,
+    'NUMERIC': np.number,
+    'TEXT': object
+}
+
+# Set once the first connection has built the indexes the checks rely on
+_indexes_ensured = False
+
+# Allowlist of table names, loaded from sqlite_master on first use
+_known_tables = frozenset()
+
+# Cached row counts keyed by table name: (expiry time, count)
+_count_cache = {}
+
+# Summaries of quality result files keyed by filename, with the file
+# mtimes they were parsed at
+_results_index = {}
+_results_mtimes = {}
+
+def get_db():
+    """Get the SQLite connection for the current request.
+    
+    The connection is opened on first use and cached on ``g`` so every
+    query in the request shares it; it is closed by ``close_db``.
+    
+    Returns:
+        sqlite3.Connection: Connection to the database
+    """
+    global _indexes_ensured
+    db = getattr(g, '_db', None)
+    if db is None:
+        # Rows come back as plain tuples; handlers zip them with the
+        # cursor's column names when they need dicts
+        db = g._db = sqlite3.connect(DB_PATH, check_same_thread=False)
+        for pragma in SQLITE_PRAGMAS:
+            db.execute(f'PRAGMA {pragma}')
+        if not _indexes_ensured:
+            ensure_indexes(db)
+            _indexes_ensured = True
+    return db
+
+@app.teardown_appcontext
+def close_db(exception):
+    """Close the request's database connection, if one was opened."""
+    db = g.pop('_db', None)
+    if db is not None:
+        db.close()
+
+def json_response(payload, status=200):
+    """Serialize a payload with orjson into a JSON response.
+    
+    Args:
+        payload: JSON-serializable object; NumPy values are supported
+        status (int): HTTP status code
+        
+    Returns:
+        Response: Flask response with an application/json body
+    """
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+def is_known_table(table_name):
+    """Check a table name against the cached allowlist.
+    
+    The allowlist is reloaded from ``sqlite_master`` only when it is empty
+    or the name is missing, so a rebuilt database is picked up without
+    scanning the catalog on every request.
+    
+    Args:
+        table_name (str): Name of the table
+        
+    Returns:
+        bool: True if the table exists in the database
+    """
+    global _known_tables
+    if table_name not in _known_tables:
+        cursor = get_db().execute("SELECT name FROM sqlite_master WHERE type='table'")
+        _known_tables = frozenset(row[0] for row in cursor)
+    return table_name in _known_tables
+
+@lru_cache(maxsize=64)
+def _schema_sql(table_name):
+    """Build the table_info PRAGMA for a known table."""
+    return f'PRAGMA table_info("{table_name}")'
+
+@lru_cache(maxsize=64)
+def _count_sql(table_name):
+    """Build the row count query for a known table."""
+    return f'SELECT COUNT(*) FROM "{table_name}"'
+
+@lru_cache(maxsize=64)
+def _select_sql(table_name):
+    """Build the paginated select query for a known table."""
+    return f'SELECT * FROM "{table_name}" LIMIT ? OFFSET ?'
+
+@lru_cache(maxsize=64)
+def _keyset_sql(table_name):
+    """Build the rowid keyset select query for a known table.
+    
+    One row past the page is selected to tell whether another page follows.
+    """
+    return f'SELECT rowid, * FROM "{table_name}" WHERE rowid > ? ORDER BY rowid LIMIT ?'
+
+def get_row_count(table_name):
+    """Get a table's row count, reusing it for ``COUNT_CACHE_TTL`` seconds.
+    
+    Args:
+        table_name (str): Name of a known table
+        
+    Returns:
+        int: Number of rows in the table
+    """
+    now = time.monotonic()
+    cached = _count_cache.get(table_name)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    count = get_db().execute(_count_sql(table_name)).fetchone()[0]
+    _count_cache[table_name] = (now + COUNT_CACHE_TTL, count)
+    return count
+
+def unknown_table_response(table_name):
+    """Build the 400 response for a table name outside the allowlist."""
+    return json_response({'error': f'Unknown table: {table_name}'}, 400)
 
-def get_db_connection():
-    """Get a connection to the SQLite database.
+def get_table_columns(table_name):
+    """Get the column names of a known table in declaration order.
     
+    Args:
+        table_name (str): Name of a known table
+        
+    Returns:
+        list: Column names
+    """
+    return [row[1] for row in get_db().execute(_schema_sql(table_name))]
+
+def read_table(db, table_name, columns=None):
+    """Load a known table, or some of its columns, into a DataFrame.
+    
+    Args:
+        db (sqlite3.Connection): Connection to read from
+        table_name (str): Name of a known table
+        columns (list): Known column names to load; all columns if None
+        
+    Returns:
+        pd.DataFrame: Table contents
+    """
+    selected = ', '.join(f'"{column}"' for column in columns) if columns else '*'
+    return pd.read_sql_query(f'SELECT {selected} FROM "{table_name}"', db)
+
+def list_result_summaries(results_dir):
+    """List summaries of the quality result files in a directory.
+    
+    Only files that are new or whose mtime changed since the last call are
+    opened and parsed; everything else is served from ``_results_index``.
+    
+    Args:
+        results_dir (str): Directory containing result JSON files
+        
     Returns:
-        tuple: (connection, cursor) to the database
+        list: Summary dict for each result file
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-    cursor = conn.cursor()
-    return conn, cursor
+    summaries = []
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json'):
+                continue
+            
+            mtime = entry.stat().st_mtime_ns
+            if _results_mtimes.get(entry.name) != mtime:
+                with open(entry.path, 'rb') as f:
+                    data = orjson.loads(f.read())
+                
+                _results_index[entry.name] = {
+                    'filename': entry.name,
+                    'check_name': data.get('check_name', 'Unknown'),
+                    'status': data.get('status', 'unknown'),
+                    'timestamp': data.get('timestamp', ''),
+                    'issue_count': len(data.get('issues', []))
+                }
+                _results_mtimes[entry.name] = mtime
+            
+            summaries.append(_results_index[entry.name])
+    
+    # Forget files that have been removed since the last scan
+    if len(_results_index) > len(summaries):
+        current = {summary['filename'] for summary in summaries}
+        for filename in list(_results_index):
+            if filename not in current:
+                del _results_index[filename]
+                del _results_mtimes[filename]
+    
+    return summaries
 
 @app.route('/')
 def index():
@@ -49,13 +260,12 @@ def get_tables():
         JSON: List of table names
     """
     try:
-        conn, cursor = get_db_connection()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row['name'] for row in cursor.fetchall()]
-        conn.close()
-        return jsonify({'tables': tables})
+        db = get_db()
+        cursor = db.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tables = [row[0] for row in cursor.fetchall()]
+        return json_response({'tables': tables})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/tables/<table_name>', methods=['GET'])
 def get_table_schema(table_name):
@@ -68,18 +278,26 @@ def get_table_schema(table_name):
         JSON: Table schema
     """
     try:
-        conn, cursor = get_db_connection()
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return jsonify({'table': table_name, 'columns': columns})
+        if not is_known_table(table_name):
+            return unknown_table_response(table_name)
+        
+        cursor = get_db().execute(_schema_sql(table_name))
+        fields = tuple(col[0] for col in cursor.description)
+        columns = [dict(zip(fields, row)) for row in cursor.fetchall()]
+        return json_response({'table': table_name, 'columns': columns})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/tables/<table_name>/data', methods=['GET'])
 def get_table_data(table_name):
     """Get data from a specific table.
     
+    Pages are selected with ``limit``/``offset``, or with ``after_id`` for
+    keyset pagination: rows whose rowid is greater than ``after_id`` are
+    returned in rowid order along with ``next_after_id`` for the following
+    page, which is null on the last page. Keyset pages cost O(log N + limit) however deep they are, while
+    OFFSET has to step over every skipped row.
+    
     Args:
         table_name (str): Name of the table
         
@@ -90,36 +308,76 @@ def get_table_data(table_name):
         # Get query parameters
         limit = request.args.get('limit', 100, type=int)
         offset = request.args.get('offset', 0, type=int)
+        after_id = request.args.get('after_id')
+        if after_id is not None:
+            try:
+                after_id = int(after_id)
+            except ValueError:
+                return json_response({'error': 'after_id must be an integer'}, 400)
         
-        conn, cursor = get_db_connection()
-        cursor.execute(f"SELECT * FROM {table_name} LIMIT ? OFFSET ?", (limit, offset))
-        data = [dict(row) for row in cursor.fetchall()]
+        if not is_known_table(table_name):
+            return unknown_table_response(table_name)
         
         # Get total count
-        cursor.execute(f"SELECT COUNT(*) as count FROM {table_name}")
-        total = cursor.fetchone()['count']
-        
-        conn.close()
-        return jsonify({
-            'table': table_name,
-            'data': data,
-            'meta': {
-                'total': total,
-                'limit': limit,
-                'offset': offset
-            }
-        })
+        total = get_row_count(table_name)
+        
+        cursor = get_db().cursor()
+        cursor.arraysize = FETCH_CHUNK_SIZE
+        if after_id is None:
+            cursor.execute(_select_sql(table_name), (limit, offset))
+            columns = tuple(col[0] for col in cursor.description)
+            meta = {'total': total, 'limit': limit, 'offset': offset}
+        else:
+            # The leading rowid column only drives pagination
+            cursor.execute(_keyset_sql(table_name), (after_id, limit + 1))
+            columns = tuple(col[0] for col in cursor.description[1:])
+            meta = {'total': total, 'limit': limit, 'after_id': after_id}
+        
+        head = orjson.dumps({'table': table_name, 'meta': meta})
+        
+        def generate():
+            # Emit the envelope, then the rows one fetchmany() chunk at a time
+            # so the full result set is never held in memory
+            yield head[:-1] + b',"data":['
+            first = True
+            remaining = limit
+            last_id = after_id
+            next_after_id = None
+            while rows := cursor.fetchmany():
+                if after_id is None:
+                    records = [dict(zip(columns, row)) for row in rows]
+                else:
+                    # A row beyond the page means another page follows
+                    has_more = len(rows) > remaining
+                    rows = rows[:remaining]
+                    remaining -= len(rows)
+                    if rows:
+                        last_id = rows[-1][0]
+                    if has_more:
+                        next_after_id = last_id
+                    records = [dict(zip(columns, row[1:])) for row in rows]
+                if records:
+                    chunk = orjson.dumps(records)
+                    yield (chunk[1:-1] if first else b',' + chunk[1:-1])
+                    first = False
+            if after_id is None:
+                yield b']}'
+            else:
+                yield b'],"next_after_id":' + orjson.dumps(next_after_id) + b'}'
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/quality/null-check', methods=['POST'])
-def run_null_check():
+async def run_null_check():
     """Run a null value check on specified table and columns.
     
     Request body:
         {
             "table": "table_name",
-            "columns": ["column1", "column2", ...]
+            "columns": ["column1", "column2", ...],
+            "threshold": 0.1
         }
         
     Returns:
@@ -131,17 +389,47 @@ def run_null_check():
         columns = data.get('columns', [])
         
         if not table or not columns:
-            return jsonify({'error': 'Table and columns are required'}), 400
+            return json_response({'error': 'Table and columns are required'}, 400)
+        if not is_known_table(table):
+            return unknown_table_response(table)
+        unknown_columns = sorted(set(columns) - set(get_table_columns(table)))
+        if unknown_columns:
+            return json_response({'error': f'Unknown columns: {unknown_columns}'}, 400)
         
-        check = NullValueCheck(table, columns)
-        results = check.run()
+        check = NullCheck.get(data.get('threshold', 0.1))
+        # Read the table and run the check off the event loop
+        df = await asyncio.to_thread(read_table, get_db(), table, columns)
+        results = await asyncio.to_thread(check.run, df)
         
-        return jsonify(results)
+        return json_response(results)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+def schema_check_args(columns):
+    """Translate one table's schema from a request into SchemaCheck arguments.
+    
+    Args:
+        columns (dict): Column specs keyed by name, as in the request body
+        
+    Returns:
+        tuple: Expected columns, required columns and column types
+    """
+    required = []
+    column_types = {}
+    for column, spec in columns.items():
+        nullable = spec.get('nullable', True) and not spec.get('primary_key', False)
+        if not nullable:
+            required.append(column)
+        dtype = SQL_TYPE_DTYPES.get(str(spec.get('type', '')).upper())
+        # pandas loads a nullable INTEGER column holding NULLs as floats
+        if dtype is np.integer and nullable:
+            dtype = np.number
+        if dtype is not None:
+            column_types[column] = dtype
+    return list(columns), required, column_types
 
 @app.route('/api/quality/schema-check', methods=['POST'])
-def run_schema_check():
+async def run_schema_check():
     """Run a schema validation check.
     
     Request body:
@@ -159,34 +447,49 @@ def run_schema_check():
             }
         }
         
+    Non-nullable and primary key columns are required; every listed column
+    is expected, and its type is checked when it is one of
+    ``SQL_TYPE_DTYPES``.
+        
     Returns:
-        JSON: Check results
+        JSON: Check results per table
     """
     try:
         data = request.json
         schema = data.get('schema', {})
         
         if not schema:
-            return jsonify({'error': 'Schema is required'}), 400
+            return json_response({'error': 'Schema is required'}, 400)
+        for table in schema:
+            if not is_known_table(table):
+                return unknown_table_response(table)
         
-        check = SchemaValidationCheck(schema)
-        results = check.run()
+        db = get_db()
+        results = {}
+        for table, columns in schema.items():
+            check = SchemaCheck.get(*schema_check_args(columns))
+            # Read the table and run the check off the event loop
+            df = await asyncio.to_thread(read_table, db, table)
+            results[table] = await asyncio.to_thread(check.run, df)
         
-        return jsonify(results)
+        return json_response(results)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/quality/anomaly-check', methods=['POST'])
-def run_anomaly_check():
+async def run_anomaly_check():
     """Run a statistical anomaly check.
     
     Request body:
         {
             "table": "table_name",
             "column": "column_name",
-            "method": "zscore" or "iqr",
+            "method": "zscore",
             "threshold": 3.0
         }
+    
+    Only ``zscore``, the median/MAD modified z-score of AnomalyCheck, is
+    supported.
         
     Returns:
         JSON: Check results
@@ -199,14 +502,22 @@ def run_anomaly_check():
         threshold = data.get('threshold', 3.0)
         
         if not table or not column:
-            return jsonify({'error': 'Table and column are required'}), 400
+            return json_response({'error': 'Table and column are required'}, 400)
+        if method != 'zscore':
+            return json_response({'error': f'Unsupported method: {method}'}, 400)
+        if not is_known_table(table):
+            return unknown_table_response(table)
+        if column not in get_table_columns(table):
+            return json_response({'error': f'Unknown column: {column}'}, 400)
         
-        check = StatisticalAnomalyCheck(table, column, method, threshold)
-        results = check.run()
+        check = AnomalyCheck.get(threshold, [column])
+        # Read the column and run the check off the event loop
+        df = await asyncio.to_thread(read_table, get_db(), table, [column])
+        results = await asyncio.to_thread(check.run, df)
         
-        return jsonify(results)
+        return json_response(results)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/quality/results', methods=['GET'])
 def get_quality_results():
@@ -216,28 +527,14 @@ def get_quality_results():
         JSON: List of result files
     """
     try:
-        results_dir = 'data/quality_results'
-        if not os.path.exists(results_dir):
-            return jsonify({'results': []})
-        
-        result_files = []
-        for filename in os.listdir(results_dir):
-            if filename.endswith('.json'):
-                file_path = os.path.join(results_dir, filename)
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                result_files.append({
-                    'filename': filename,
-                    'check_name': data.get('check_name', 'Unknown'),
-                    'status': data.get('status', 'unknown'),
-                    'timestamp': data.get('timestamp', ''),
-                    'issue_count': len(data.get('issues', []))
-                })
+        if not os.path.exists(QUALITY_RESULTS_DIR):
+            return json_response({'results': []})
+        
+        result_files = list_result_summaries(QUALITY_RESULTS_DIR)
         
-        return jsonify({'results': result_files})
+        return json_response({'results': result_files})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/quality/results/<filename>', methods=['GET'])
 def get_quality_result(filename):
@@ -250,27 +547,26 @@ def get_quality_result(filename):
         JSON: Check result
     """
     try:
-        results_dir = 'data/quality_results'
-        file_path = os.path.join(results_dir, filename)
+        file_path = os.path.join(QUALITY_RESULTS_DIR, filename)
         
         if not os.path.exists(file_path):
-            return jsonify({'error': 'Result file not found'}), 404
+            return json_response({'error': 'Result file not found'}, 404)
         
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
         
-        return jsonify(data)
+        return json_response(data)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 if __name__ == '__main__':
     # Create templates and static directories if they don't exist
     os.makedirs('src/api/templates', exist_ok=True)
     os.makedirs('src/api/static', exist_ok=True)
     
-    # Get host and port from environment
-    host = os.getenv('API_HOST', 'localhost')
-    port = int(os.getenv('API_PORT', 5000))
-    debug = os.getenv('DEBUG', 'True').lower() in ('true', '1', 't')
+    # Compile the check kernels here on the main thread; the check
+    # endpoints run them on worker threads
+    from src.data_quality import warm_up
+    warm_up()
     
-    app.run(host=host, port=port, debug=debug)
+    app.run(host=config.api_host, port=config.api_port, debug=config.debug)
@@ -0,0 +1,35 @@
+"""
+Runtime configuration for the Healthcare Data QA services.
+
+Environment variables (and a local .env file) are read once at import
+into a frozen ``Config`` instance, so callers use plain attribute lookups
+instead of querying ``os.environ`` at call time.
+"""
+
+import os
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def _env_flag(name: str, default: str) -> bool:
+    """Interpret an environment variable as a boolean flag."""
+    return os.getenv(name, default).lower() in ('true', '1', 't')
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings shared by the API server, web dashboard and check runner."""
+
+    db_path: str = field(default_factory=lambda: os.getenv('DB_PATH', 'data/db/healthcare.db'))
+    api_host: str = field(default_factory=lambda: os.getenv('API_HOST', 'localhost'))
+    api_port: int = field(default_factory=lambda: int(os.getenv('API_PORT', 5000)))
+    web_host: str = field(default_factory=lambda: os.getenv('WEB_HOST', 'localhost'))
+    web_port: int = field(default_factory=lambda: int(os.getenv('WEB_PORT', 5001)))
+    debug: bool = field(default_factory=lambda: _env_flag('DEBUG', 'True'))
+    secret_key: str = field(default_factory=lambda: os.getenv('FLASK_SECRET_KEY', 'dev'), repr=False)
+
+
+config = Config()
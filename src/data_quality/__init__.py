@@ -1,5 +1,23 @@
 """Data quality checks for healthcare data."""
 
 from .run_checks import run_all_checks
+from . import _anomaly_kernels, _rule_kernels
 
-__all__ = ['run_all_checks']
+
+def warm_up():
+    """
+    Compile the anomaly and rule kernels ahead of the first check.
+
+    Importing the package does not compile them, since that would add
+    seconds to every import; long-running servers call this once at
+    startup instead, and otherwise the first check compiles them.
+
+    Call it from the main thread before running checks on worker threads:
+    under numba's TBB threading layer, a parallel kernel first launched
+    from a worker thread can hang while the layer starts up.
+    """
+    _anomaly_kernels.warm_up()
+    _rule_kernels.warm_up()
+
+
+__all__ = ['run_all_checks', 'warm_up']
@@ -0,0 +1,78 @@
+"""
+Numeric kernels for the statistical anomaly check.
+
+Author: Robert Torres
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the numpy path is used instead
+    njit = None
+
+# Scales the MAD to the standard deviation of a normal distribution
+MAD_SCALE = 1.4826
+
+# Scales the mean absolute deviation likewise, for columns whose MAD is 0
+MEANAD_SCALE = 1.253314
+
+
+if njit is not None:
+    # fastmath is deliberately left off: it assumes no NaNs, and missing
+    # values must keep comparing False against the threshold
+    @njit(cache=True, parallel=True)
+    def modified_z_scores(arr, valid):
+        """
+        Compute absolute modified z-scores (Iglewicz and Hoaglin).
+
+        Args:
+            arr: Column values as float64, NaN for missing entries
+            valid: The non-missing values of ``arr``, used for the median and MAD
+
+        Returns:
+            Array of ``|x - median| / (1.4826 * MAD)``, or of
+            ``|x - median| / (1.253314 * meanAD)`` when the MAD is 0; all
+            zeros when both deviations are 0
+        """
+        scores = np.zeros(arr.size)
+        if valid.size == 0:
+            return scores
+
+        median = np.median(valid)
+        deviations = np.abs(valid - median)
+        scale = MAD_SCALE * np.median(deviations)
+        if scale == 0:
+            # More than half the values equal the median
+            scale = MEANAD_SCALE * deviations.mean()
+            if scale == 0:
+                return scores
+
+        for i in prange(arr.size):
+            scores[i] = abs(arr[i] - median) / scale
+        return scores
+else:
+    def modified_z_scores(arr, valid):
+        """NumPy equivalent of the numba kernel, used when numba is missing."""
+        scores = np.zeros(arr.size)
+        if valid.size == 0:
+            return scores
+
+        median = np.median(valid)
+        deviations = np.abs(valid - median)
+        scale = MAD_SCALE * np.median(deviations)
+        if scale == 0:
+            scale = MEANAD_SCALE * deviations.mean()
+            if scale == 0:
+                return scores
+
+        np.subtract(arr, median, out=scores)
+        np.abs(scores, out=scores)
+        scores /= scale
+        return scores
+
+
+def warm_up():
+    """Compile the kernel ahead of the first real check."""
+    sample = np.arange(4, dtype=np.float64)
+    modified_z_scores(sample, sample)
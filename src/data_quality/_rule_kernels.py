@@ -0,0 +1,46 @@
+"""
+Numeric kernels for the rule-based value check.
+
+Author: Robert Torres
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the numpy path is used instead
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def range_violations(values, lows, highs):
+        """
+        Flag values outside their column's ``[low, high]`` range.
+
+        Args:
+            values: C-contiguous float64 matrix, one column per range rule
+            lows: Lower bound for each column
+            highs: Upper bound for each column
+
+        Returns:
+            Boolean matrix shaped like ``values``; NaNs compare False against
+            both bounds, so missing values are flagged
+        """
+        n_rows, n_cols = values.shape
+        out = np.empty((n_rows, n_cols), dtype=np.bool_)
+        for i in prange(n_rows):
+            for k in range(n_cols):
+                x = values[i, k]
+                out[i, k] = not ((x >= lows[k]) & (x <= highs[k]))
+        return out
+else:
+    def range_violations(values, lows, highs):
+        """NumPy equivalent of the numba kernel, used when numba is missing."""
+        return ~((values >= lows) & (values <= highs))
+
+
+def warm_up():
+    """Compile the kernel ahead of the first real check."""
+    bounds = np.zeros(1)
+    range_violations(np.zeros((2, 1)), bounds, bounds)
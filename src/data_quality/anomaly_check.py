@@ -4,28 +4,73 @@ Statistical anomaly detection check.
 Author: Robert Torres
 """
 
+from functools import lru_cache
 from typing import Dict, Any, List
 import pandas as pd
 import numpy as np
 from scipy import stats
 from .base_check import BaseCheck
+from ._anomaly_kernels import modified_z_scores
+
+
+# Quantiles reported in stats_summary: min, q1, median, q3, max
+SUMMARY_QUANTILES = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+
+
+def _order_statistics(values: np.ndarray) -> np.ndarray:
+    """
+    Compute the summary quantiles with linear interpolation.
+
+    A single np.partition call places just the needed order statistics,
+    O(N) expected rather than a full O(N log N) sort.
+
+    Args:
+        values: Non-empty array without NaNs
+
+    Returns:
+        Array of min, q1, median, q3 and max
+    """
+    positions = SUMMARY_QUANTILES * (values.size - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    part = np.partition(values, np.union1d(lower, upper))
+    return part[lower] + (part[upper] - part[lower]) * (positions - lower)
 
 
 class AnomalyCheck(BaseCheck):
     """Check for statistical anomalies in numeric columns."""
 
+    __slots__ = ('z_threshold', 'columns')
+
     def __init__(self, z_threshold: float = 1.5, columns: List[str] = None):
         """
         Initialize the anomaly check.
 
         Args:
-            z_threshold: Z-score threshold for anomaly detection (default: 3.0)
+            z_threshold: Modified z-score threshold for anomaly detection (default: 1.5)
             columns: List of columns to check (if None, checks all numeric columns)
         """
         super().__init__()
         self.z_threshold = z_threshold
         self.columns = columns
 
+    @classmethod
+    def get(cls, z_threshold: float = 1.5, columns: List[str] = None) -> 'AnomalyCheck':
+        """
+        Get a shared anomaly check for the given threshold and columns.
+
+        The instance may be run from several threads at once; each caller
+        should use the dict ``run`` returns rather than ``results``.
+
+        Args:
+            z_threshold: Modified z-score threshold for anomaly detection
+            columns: List of columns to check (if None, checks all numeric columns)
+
+        Returns:
+            Cached AnomalyCheck instance
+        """
+        return _get_anomaly_check(z_threshold, None if columns is None else tuple(columns))
+
     def run(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Run anomaly detection on DataFrame.
@@ -45,44 +90,64 @@ class AnomalyCheck(BaseCheck):
 
         anomalies = {}
         stats_summary = {}
+        n_rows = len(df)
         
-        for col in columns_to_check:
-            # Calculate z-scores for the entire column
+        # Convert every checked column to float64 in one pass, column-major
+        # so each column is a contiguous slice, and find all NaNs at once;
+        # every statistic then comes from plain NumPy reductions
+        values = np.asfortranarray(
+            df[list(columns_to_check)].to_numpy(dtype=np.float64, na_value=np.nan)
+        )
+        nan_mask = np.isnan(values)
+        has_nan = nan_mask.any(axis=0)
+        
+        for k, col in enumerate(columns_to_check):
             series = df[col]
-            mean = series.mean()
-            std = series.std()
+            arr = values[:, k]
+            valid = arr[~nan_mask[:, k]] if has_nan[k] else arr
             
-            # Handle zero standard deviation
-            if std == 0:
-                z_scores = np.zeros(len(series))
+            if valid.size:
+                mean = valid.mean()
+                std = valid.std(ddof=1) if valid.size > 1 else np.nan
+                col_min, q1, median, q3, col_max = _order_statistics(valid)
             else:
-                z_scores = np.abs((series - mean) / std)
+                mean = std = col_min = q1 = median = q3 = col_max = np.nan
+            
+            # Score the column against its median and MAD so the outliers
+            # themselves cannot inflate the spread and mask each other
+            z_scores = modified_z_scores(arr, valid)
             
             # Identify anomalies using modified z-score method
-            anomaly_mask = z_scores > self.z_threshold
-            anomaly_indices = series.index[anomaly_mask].tolist()
-            anomaly_values = series[anomaly_mask].tolist()
+            anomaly_positions = np.flatnonzero(z_scores > self.z_threshold)
+            n_anomalies = int(anomaly_positions.size)
+            
+            # Gather indices and values straight from the positions; float64
+            # columns reuse the array already extracted above, other dtypes
+            # keep their native values (e.g. ints stay ints)
+            raw_values = arr if series.dtype == np.float64 else series.to_numpy()
+            anomaly_indices = series.index.take(anomaly_positions).tolist()
+            anomaly_values = raw_values[anomaly_positions].tolist()
             
             # Calculate statistics
             stats_summary[col] = {
-                'mean': df[col].mean(),
-                'std': df[col].std(),
-                'min': df[col].min(),
-                'max': df[col].max(),
-                'q1': df[col].quantile(0.25),
-                'median': df[col].median(),
-                'q3': df[col].quantile(0.75)
+                'mean': mean,
+                'std': std,
+                'min': col_min,
+                'max': col_max,
+                'q1': q1,
+                'median': median,
+                'q3': q3
             }
             
             anomalies[col] = {
-                'count': len(anomaly_indices),
+                'count': n_anomalies,
                 'indices': anomaly_indices,  # Already a list
                 'values': anomaly_values,    # Already a list
-                'percentage': (len(anomaly_indices) / len(df)) * 100
+                'percentage': n_anomalies * 100.0 / n_rows
             }
 
         # Store results
-        self.results = {
+        results = {
             'anomalies': anomalies,
             'stats_summary': stats_summary,
             'z_threshold': self.z_threshold,
@@ -90,4 +155,11 @@ class AnomalyCheck(BaseCheck):
             'passed': all(info['count'] == 0 for info in anomalies.values())
         }
         
-        return self.results
+        self.results = results
+        return results
+
+
+@lru_cache(maxsize=128)
+def _get_anomaly_check(z_threshold: float, columns: tuple) -> AnomalyCheck:
+    """Build the AnomalyCheck behind ``AnomalyCheck.get`` for a hashable key."""
+    return AnomalyCheck(z_threshold, None if columns is None else list(columns))
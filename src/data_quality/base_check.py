@@ -12,6 +12,8 @@ from typing import Dict, Any
 class BaseCheck(ABC):
     """Base class for implementing data quality checks."""
 
+    __slots__ = ('results',)
+
     def __init__(self):
         """Initialize the check."""
         self.results = {}
@@ -21,6 +23,10 @@ class BaseCheck(ABC):
         """
         Run the data quality check.
 
+        Implementations build a fresh results dict and return it, so callers
+        sharing one instance across threads each get their own results;
+        ``results`` only mirrors the most recent run.
+
         Args:
             df: DataFrame to validate
 
@@ -30,5 +36,5 @@ class BaseCheck(ABC):
         pass
 
     def get_results(self) -> Dict[str, Any]:
-        """Get the results of the last check run."""
+        """Get the results of the last check run, by any caller."""
         return self.results
@@ -4,6 +4,7 @@ Null value validation check.
 Author: Robert Torres
 """
 
+from functools import lru_cache
 from typing import Dict, Any
 import pandas as pd
 from .base_check import BaseCheck
@@ -12,6 +13,8 @@ from .base_check import BaseCheck
 class NullCheck(BaseCheck):
     """Check for null values in DataFrame columns."""
 
+    __slots__ = ('threshold',)
+
     def __init__(self, threshold: float = 0.1):
         """
         Initialize the null check.
@@ -22,6 +25,22 @@ class NullCheck(BaseCheck):
         super().__init__()
         self.threshold = threshold
 
+    @classmethod
+    def get(cls, threshold: float = 0.1) -> 'NullCheck':
+        """
+        Get a shared null check for the given threshold.
+
+        The instance may be run from several threads at once; each caller
+        should use the dict ``run`` returns rather than ``results``.
+
+        Args:
+            threshold: Maximum allowed percentage of null values
+
+        Returns:
+            Cached NullCheck instance
+        """
+        return _get_null_check(threshold)
+
     def run(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Run null value checks on DataFrame.
@@ -32,26 +51,53 @@ class NullCheck(BaseCheck):
         Returns:
             Dictionary containing validation results
         """
-        # Calculate null percentages
-        null_counts = df.isnull().sum()
-        null_percentages = null_counts / len(df)
+        columns = df.columns.tolist()
+        n_rows = len(df)
+        
+        # Nothing can be null in an empty frame; skip building the mask
+        if n_rows == 0 or not columns:
+            results = {
+                'null_counts': dict.fromkeys(columns, 0),
+                'null_percentages': dict.fromkeys(columns, 0.0),
+                'failed_columns': {},
+                'total_null_percentage': 0.0,
+                'passed': True,
+                'threshold': self.threshold
+            }
+            self.results = results
+            return results
+        
+        # Reduce one boolean matrix column-wise instead of going through
+        # pandas' per-column Series path
+        counts = df.isna().to_numpy().sum(axis=0)
+        percentages = counts / n_rows
+        
+        null_counts = dict(zip(columns, counts.tolist()))
+        null_percentages = dict(zip(columns, percentages.tolist()))
         
         # Identify columns exceeding threshold
-        failed_columns = null_percentages[null_percentages > self.threshold]
+        failed_columns = {
+            col: pct for col, pct in null_percentages.items() if pct > self.threshold
+        }
         
         # Calculate total null percentage
-        total_nulls = null_counts.sum()
-        total_cells = len(df) * len(df.columns)
-        total_null_percentage = (total_nulls / total_cells) * 100
+        total_null_percentage = (counts.sum() / counts.size / n_rows) * 100
 
         # Store results
-        self.results = {
-            'null_counts': null_counts.to_dict(),
-            'null_percentages': null_percentages.to_dict(),
-            'failed_columns': failed_columns.to_dict(),
+        results = {
+            'null_counts': null_counts,
+            'null_percentages': null_percentages,
+            'failed_columns': failed_columns,
             'total_null_percentage': total_null_percentage,
             'passed': len(failed_columns) == 0,
             'threshold': self.threshold
         }
         
-        return self.results
+        self.results = results
+        return results
+
+
+@lru_cache(maxsize=128)
+def _get_null_check(threshold: float) -> NullCheck:
+    """Build the NullCheck behind ``NullCheck.get`` for a threshold."""
+    return NullCheck(threshold)
@@ -0,0 +1,98 @@
+"""
+Rule-based value validation check.
+
+Author: Robert Torres
+"""
+
+from typing import Dict, Any, Tuple
+import pandas as pd
+import numpy as np
+from .base_check import BaseCheck
+from ._rule_kernels import range_violations
+
+
+# Result key and issue name for each supported rule kind
+RULE_KINDS = {
+    'range': ('range_issues', 'invalid_range'),
+    'isin': ('category_issues', 'invalid_category')
+}
+
+
+def _not_in(series: pd.Series, allowed) -> np.ndarray:
+    """
+    Flag values outside ``allowed`` by comparing integer category codes.
+
+    Missing values get code -1 and are flagged, like ``~Series.isin``.
+    """
+    categorical = series.astype('category')
+    codes = categorical.cat.categories.get_indexer(list(allowed))
+    return ~np.isin(categorical.cat.codes.to_numpy(), codes[codes >= 0])
+
+
+class RuleCheck(BaseCheck):
+    """Check column values against per-column range and membership rules."""
+
+    __slots__ = ('rules',)
+
+    def __init__(self, rules: Dict[str, Tuple]):
+        """
+        Initialize the rule check.
+
+        Args:
+            rules: Rule per column, either ``('range', low, high)`` or
+                ``('isin', allowed_values)``
+
+        Raises:
+            ValueError: If a rule has an unsupported kind
+        """
+        super().__init__()
+        for column, rule in rules.items():
+            if rule[0] not in RULE_KINDS:
+                raise ValueError(f"Unsupported rule {rule[0]!r} for column {column!r}")
+        self.rules = rules
+
+    def run(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Run the rules on DataFrame; columns missing from it are skipped.
+
+        Args:
+            df: DataFrame to validate
+
+        Returns:
+            Dictionary containing validation results, with the issues of
+            each rule kind listed under its ``RULE_KINDS`` key
+        """
+        issues = {key: [] for key, _ in RULE_KINDS.values()}
+        rules = {column: rule for column, rule in self.rules.items() if column in df.columns}
+
+        # Every range rule is evaluated by one kernel call over a float64
+        # matrix of its columns; like ~Series.between, NaNs are flagged
+        range_columns = [column for column, rule in rules.items() if rule[0] == 'range']
+        if range_columns:
+            values = np.ascontiguousarray(
+                df[range_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            )
+            lows = np.array([rules[column][1] for column in range_columns], dtype=np.float64)
+            highs = np.array([rules[column][2] for column in range_columns], dtype=np.float64)
+            violations = range_violations(values, lows, highs)
+            range_masks = dict(zip(range_columns, violations.T))
+
+        for column, (kind, *args) in rules.items():
+            series = df[column]
+            mask = range_masks[column] if kind == 'range' else _not_in(series, *args)
+            if mask.any():
+                key, issue = RULE_KINDS[kind]
+                issues[key].append({
+                    'column': column,
+                    'issue': issue,
+                    'indices': series.index[mask].tolist()
+                })
+
+        # Store results
+        results = {
+            **issues,
+            'passed': not any(issues.values())
+        }
+
+        self.results = results
+        return results
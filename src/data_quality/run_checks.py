@@ -1,39 +1,71 @@
 """Run data quality checks on healthcare data."""
 
 import sqlite3
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
-import pandas as pd
 import numpy as np
 
-def check_null_values(conn, table_name):
+# Indexes the checks rely on, created on whichever tables exist; the
+# consistency check's anti-joins look charges up by patient_id
+CHECK_INDEXES = (
+    ('insurance_charges', 'ix_ic_patient_id',
+     'CREATE INDEX IF NOT EXISTS ix_ic_patient_id ON insurance_charges (patient_id)'),
+)
+
+def ensure_indexes(conn):
+    """Create the indexes the checks and the API rely on.
+    
+    ANALYZE runs only when an index was just created or the database has no
+    planner statistics yet, so repeat runs do not rescan every table.
+    """
+    rows = conn.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')").fetchall()
+    tables = {name for kind, name in rows if kind == 'table'}
+    indexes = {name for kind, name in rows if kind == 'index'}
+    
+    created = False
+    for table, index, statement in CHECK_INDEXES:
+        if table in tables and index not in indexes:
+            conn.execute(statement)
+            created = True
+    if created or 'sqlite_stat1' not in tables:
+        conn.execute('ANALYZE')
+    conn.commit()
+
+def get_table_columns(conn, table_name):
+    """Get the column names of a table in declaration order."""
+    cursor = conn.execute(f'PRAGMA table_info("{table_name}")')
+    return [row[1] for row in cursor.fetchall()]
+
+def check_null_values(conn, table_name, timestamp=None):
     """Check for null values in all columns of a table."""
-    df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-    null_counts = df.isnull().sum()
+    # Count the nulls of every column in one SQL pass instead of loading
+    # the whole table into a DataFrame
+    columns = get_table_columns(conn, table_name)
+    null_sums = ', '.join(f'COALESCE(SUM("{column}" IS NULL), 0)' for column in columns)
+    null_counts = conn.execute(f'SELECT {null_sums} FROM "{table_name}"').fetchone()
     
     issues = []
-    for column in null_counts.index:
-        if null_counts[column] > 0:
+    for column, null_count in zip(columns, null_counts):
+        if null_count > 0:
             issues.append({
                 "type": "null_value",
                 "column": column,
-                "count": int(null_counts[column]),
-                "details": f"Found {null_counts[column]} null values in column {column}"
+                "count": null_count,
+                "details": f"Found {null_count} null values in column {column}"
             })
     
     return {
         "check_name": "Null Value Check",
         "table": table_name,
         "status": "failed" if issues else "passed",
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "issues": issues
     }
 
-def check_value_ranges(conn, table_name):
+def check_value_ranges(conn, table_name, timestamp=None):
     """Check if numeric values are within expected ranges."""
-    df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-    
     range_checks = {
         "patients": {
             "age": (0, 120),
@@ -47,92 +79,160 @@ def check_value_ranges(conn, table_name):
     
     issues = []
     if table_name in range_checks:
-        for column, (min_val, max_val) in range_checks[table_name].items():
-            if column in df.columns:
-                out_of_range = df[
-                    (df[column] < min_val) | (df[column] > max_val)
-                ]
-                if not out_of_range.empty:
+        table_columns = set(get_table_columns(conn, table_name))
+        ranges = [
+            (column, bounds) for column, bounds in range_checks[table_name].items()
+            if column in table_columns
+        ]
+        
+        # Count the out-of-range values of every configured column in one
+        # SQL pass; NULLs compare as unknown and are not counted
+        if ranges:
+            range_sums = ', '.join(
+                f'COALESCE(SUM("{column}" < ? OR "{column}" > ?), 0)' for column, _ in ranges
+            )
+            params = [bound for _, bounds in ranges for bound in bounds]
+            counts = conn.execute(f'SELECT {range_sums} FROM "{table_name}"', params).fetchone()
+            
+            for (column, (min_val, max_val)), count in zip(ranges, counts):
+                if count > 0:
                     issues.append({
                         "type": "out_of_range",
                         "column": column,
-                        "count": len(out_of_range),
-                        "details": f"Found {len(out_of_range)} values outside range [{min_val}, {max_val}] in column {column}"
+                        "count": count,
+                        "details": f"Found {count} values outside range [{min_val}, {max_val}] in column {column}"
                     })
     
     return {
         "check_name": "Value Range Check",
         "table": table_name,
         "status": "failed" if issues else "passed",
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "issues": issues
     }
 
-def check_data_consistency(conn):
+def check_data_consistency(conn, timestamp=None):
     """Check data consistency between related tables."""
-    patient_ids_charges = pd.read_sql_query(
-        "SELECT DISTINCT patient_id FROM insurance_charges", 
-        conn
-    )
-    patient_ids_main = pd.read_sql_query(
-        "SELECT id FROM patients", 
-        conn
-    )
-    
-    missing_patients = set(patient_ids_charges['patient_id']) - set(patient_ids_main['id'])
-    orphaned_charges = set(patient_ids_main['id']) - set(patient_ids_charges['patient_id'])
+    # Let SQLite run both anti-joins over the patient_id index rather than
+    # building and diffing Python sets of every ID. COUNT(DISTINCT) skips
+    # NULLs, so a NULL patient_id is added as one more missing reference.
+    missing_patients = conn.execute('''
+        SELECT COUNT(DISTINCT c.patient_id) + COALESCE(MAX(c.patient_id IS NULL), 0)
+        FROM insurance_charges c
+        WHERE NOT EXISTS (SELECT 1 FROM patients p WHERE p.id = c.patient_id)
+    ''').fetchone()[0]
+    orphaned_charges = conn.execute('''
+        SELECT COUNT(*) FROM patients p
+        WHERE NOT EXISTS (SELECT 1 FROM insurance_charges c WHERE c.patient_id = p.id)
+    ''').fetchone()[0]
     
     issues = []
     if missing_patients:
         issues.append({
             "type": "missing_reference",
-            "details": f"Found {len(missing_patients)} insurance charges with non-existent patient IDs"
+            "details": f"Found {missing_patients} insurance charges with non-existent patient IDs"
         })
     if orphaned_charges:
         issues.append({
             "type": "orphaned_record",
-            "details": f"Found {len(orphaned_charges)} patients without insurance charges"
+            "details": f"Found {orphaned_charges} patients without insurance charges"
         })
     
     return {
         "check_name": "Data Consistency Check",
         "status": "failed" if issues else "passed",
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "issues": issues
     }
 
-def run_all_checks(db_path):
-    """Run all quality checks and save results."""
+# Upper bound on checks run and result files written at the same time
+MAX_CHECK_WORKERS = 4
+
+def run_check(db_path, check, *args, **kwargs):
+    """Run one check on its own connection, since sqlite3 connections
+    must not be shared between threads."""
     conn = sqlite3.connect(db_path)
+    try:
+        return check(conn, *args, **kwargs)
+    finally:
+        conn.close()
+
+def result_filename(timestamp, result):
+    """Build the JSON filename a check result is saved under."""
+    return f"{timestamp}_{result['check_name'].replace(' ', '')}.json"
+
+def save_result(path, result):
+    """Write a check result to its JSON file.
     
+    The result is written to a temporary file and moved into place with
+    os.replace, so readers never see a partially written result.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_path, path)
+
+def sync_directory(path):
+    """Flush a directory's entries to disk with a single fsync."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # directories cannot be opened on some platforms
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def run_all_checks(db_path):
+    """Run all quality checks and save results."""
     # Create results directory if it doesn't exist
     results_dir = "data/quality_results"
     os.makedirs(results_dir, exist_ok=True)
     
-    # Run checks
-    checks = []
-    
-    # Check patients table
-    checks.append(check_null_values(conn, "patients"))
-    checks.append(check_value_ranges(conn, "patients"))
+    # Build any missing indexes before the checks query concurrently
+    run_check(db_path, ensure_indexes)
     
-    # Check insurance_charges table
-    checks.append(check_null_values(conn, "insurance_charges"))
-    checks.append(check_value_ranges(conn, "insurance_charges"))
+    # Stamp every check in the run with the same time, formatted once
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
     
-    # Check relationships
-    checks.append(check_data_consistency(conn))
+    # The checks are independent queries, so run them concurrently; sqlite3
+    # releases the GIL while a statement executes
+    with ThreadPoolExecutor(max_workers=MAX_CHECK_WORKERS) as executor:
+        futures = [
+            # Check patients table
+            executor.submit(run_check, db_path, check_null_values, "patients", timestamp=timestamp),
+            executor.submit(run_check, db_path, check_value_ranges, "patients", timestamp=timestamp),
+            
+            # Check insurance_charges table
+            executor.submit(run_check, db_path, check_null_values, "insurance_charges", timestamp=timestamp),
+            executor.submit(run_check, db_path, check_value_ranges, "insurance_charges", timestamp=timestamp),
+            
+            # Check relationships
+            executor.submit(run_check, db_path, check_data_consistency, timestamp=timestamp)
+        ]
+        checks = [future.result() for future in futures]
+        
+        # Save results; checks sharing a filename keep the last result, as
+        # sequential writes did, so no two threads write the same file
+        file_timestamp = now.strftime("%Y%m%d_%H%M%S")
+        outputs = {
+            os.path.join(results_dir, result_filename(file_timestamp, result)): result
+            for result in checks
+        }
+        list(executor.map(save_result, outputs.keys(), outputs.values()))
     
-    # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    for i, result in enumerate(checks):
-        filename = f"{timestamp}_{result['check_name'].replace(' ', '')}.json"
-        with open(os.path.join(results_dir, filename), 'w') as f:
-            json.dump(result, f, indent=2)
+    # One directory sync covers all the renames above
+    sync_directory(results_dir)
     
-    conn.close()
     return checks
 
 if __name__ == "__main__":
-    db_path = os.getenv('DB_PATH', 'data/db/healthcare.db')
-    run_all_checks(db_path)
+    import sys
+    # Add the project root to the path so the shared config is importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from src.config import config
+    
+    run_all_checks(config.db_path)
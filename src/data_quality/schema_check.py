@@ -4,15 +4,28 @@ Schema validation check.
 Author: Robert Torres
 """
 
+from functools import lru_cache
 from typing import Dict, Any, List
 import pandas as pd
 import numpy as np
 from .base_check import BaseCheck
 
 
+@lru_cache(maxsize=256)
+def _dtype_matches(actual_type: np.dtype, expected_type: type) -> bool:
+    """Check whether a column dtype satisfies an expected type."""
+    # Handle numeric type comparisons
+    if np.issubdtype(expected_type, np.number):
+        return np.issubdtype(actual_type, expected_type)
+    # Handle non-numeric type comparisons
+    return actual_type == expected_type
+
+
 class SchemaCheck(BaseCheck):
     """Check DataFrame schema against expected schema."""
 
+    __slots__ = ('expected_columns', 'required_columns', 'column_types', '_type_checks')
+
     def __init__(self, expected_columns: List[str], required_columns: List[str] = None,
                  column_types: Dict[str, type] = None):
         """
@@ -21,11 +34,42 @@ class SchemaCheck(BaseCheck):
         Args:
             expected_columns: List of expected column names
             required_columns: List of required column names (must be present)
+            column_types: Mapping of column name to expected dtype
         """
         super().__init__()
         self.expected_columns = set(expected_columns)
         self.required_columns = set(required_columns or [])
         self.column_types = column_types or {}
+        
+        # Render the expected type names once rather than on every violation
+        self._type_checks = [
+            (col, expected_type, str(expected_type))
+            for col, expected_type in self.column_types.items()
+        ]
+
+    @classmethod
+    def get(cls, expected_columns: List[str], required_columns: List[str] = None,
+            column_types: Dict[str, type] = None) -> 'SchemaCheck':
+        """
+        Get a shared schema check for the given schema.
+
+        Checks built from the same schema are reused, so batch pipelines do
+        not rebuild one per DataFrame. Use the dict ``run`` returns: the
+        instance's ``results`` reflect whichever caller ran it last.
+
+        Args:
+            expected_columns: List of expected column names
+            required_columns: List of required column names (must be present)
+            column_types: Mapping of column name to expected dtype
+
+        Returns:
+            Cached SchemaCheck instance
+        """
+        return _get_schema_check(
+            frozenset(expected_columns),
+            frozenset(required_columns or ()),
+            frozenset((column_types or {}).items())
+        )
 
     def run(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -48,28 +92,21 @@ class SchemaCheck(BaseCheck):
         # Check for unexpected columns
         unexpected_columns = actual_columns - self.expected_columns
         
-        # Check column types
+        # Check column types against one read of df.dtypes rather than
+        # building a Series per checked column
+        dtypes = dict(zip(df.columns, df.dtypes))
         type_violations = {}
-        for col, expected_type in self.column_types.items():
-            if col in df.columns:
-                actual_type = df[col].dtype
-                # Handle numeric type comparisons
-                if np.issubdtype(expected_type, np.number):
-                    if not np.issubdtype(actual_type, expected_type):
-                        type_violations[col] = {
-                            'expected': str(expected_type),
-                            'actual': str(actual_type)
-                        }
-                # Handle non-numeric type comparisons
-                else:
-                    if actual_type != expected_type:
-                        type_violations[col] = {
-                            'expected': str(expected_type),
-                            'actual': str(actual_type)
-                        }
+        for col, expected_type, expected_name in self._type_checks:
+            if col in dtypes:
+                actual_type = dtypes[col]
+                if not _dtype_matches(actual_type, expected_type):
+                    type_violations[col] = {
+                        'expected': expected_name,
+                        'actual': str(actual_type)
+                    }
 
         # Store results
-        self.results = {
+        results = {
             'missing_required': list(missing_required),
             'missing_expected': list(missing_expected),
             'unexpected_columns': list(unexpected_columns),
@@ -83,4 +120,12 @@ class SchemaCheck(BaseCheck):
                            len(type_violations) == 0)
         }
         
-        return self.results
+        self.results = results
+        return results
+
+
+@lru_cache(maxsize=256)
+def _get_schema_check(expected_columns: frozenset, required_columns: frozenset,
+                      column_types: frozenset) -> SchemaCheck:
+    """Build the SchemaCheck behind ``SchemaCheck.get`` for a hashable schema key."""
+    return SchemaCheck(list(expected_columns), list(required_columns), dict(column_types))
@@ -5,5 +5,8 @@ Author: Robert Torres
 """
 
 from .text_analyzer import HealthcareTextAnalyzer
+# Not called at import; the range kernel compiles on first use unless a
+# long-running process warms it up ahead of time
+from ._range_kernels import warm_up
 
-__all__ = ['HealthcareTextAnalyzer']
+__all__ = ['HealthcareTextAnalyzer', 'warm_up']
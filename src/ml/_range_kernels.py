@@ -0,0 +1,69 @@
+"""
+Numeric kernels for the healthcare range checks.
+
+Author: Robert Torres
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the numpy path is used instead
+    njit = None
+
+
+if njit is not None:
+    # A plain loop rather than prange: validators may be called from several
+    # threads at once, which numba's default workqueue threading layer does
+    # not allow for parallel kernels. fastmath stays off so NaNs are skipped.
+    @njit(cache=True)
+    def _range_stats(a, lo, hi):
+        # NaN compares False everywhere, so it is neither counted nor taken
+        # as an extreme, and the loop stays branch-free
+        n_within = 0
+        dmin = np.inf
+        dmax = -np.inf
+        for i in range(a.size):
+            x = a[i]
+            dmin = x if x < dmin else dmin
+            dmax = x if x > dmax else dmax
+            n_within += (x >= lo) & (x <= hi)
+        # Only an all-NaN array leaves the extremes uncrossed
+        if dmin > dmax:
+            return n_within, np.nan, np.nan
+        return n_within, dmin, dmax
+else:
+    _range_stats = None
+
+
+def range_stats(a, lo=-np.inf, hi=np.inf):
+    """
+    Count the values inside ``[lo, hi]`` and find the extremes in one pass.
+
+    Args:
+        a: Array of values
+        lo: Lower bound of the range
+        hi: Upper bound of the range
+
+    Returns:
+        Tuple of (count within range, min, max); NaNs are never within the
+        range and are ignored for the extremes, which are NaN if the array
+        is empty or every value is missing
+    """
+    if a.size == 0:
+        return 0, np.nan, np.nan
+    if (_range_stats is not None and a.dtype == np.float64
+            and a.flags.c_contiguous):
+        return _range_stats(a, lo, hi)
+
+    n_within = int(np.count_nonzero((a >= lo) & (a <= hi)))
+    dmin, dmax = np.min(a), np.max(a)
+    # NaN propagates through min/max; only then pay for the nan-aware scan
+    if np.isnan(dmin) or np.isnan(dmax):
+        dmin, dmax = np.nanmin(a), np.nanmax(a)
+    return n_within, dmin, dmax
+
+
+def warm_up():
+    """Compile the kernel ahead of the first real check."""
+    range_stats(np.arange(4, dtype=np.float64), 0.0, 2.0)
@@ -8,18 +8,89 @@ This module extends the base ModelValidator with healthcare-specific:
 4. Regulatory compliance checks
 """
 
-from typing import Dict, List, Optional, Union, Any
+from typing import Callable, Dict, List, Optional, Union, Any
+from collections import OrderedDict
+import copy
+import hashlib
+import json
 import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
 from .model_validator import ModelValidator
+from ._range_kernels import range_stats
 
 logger = logging.getLogger(__name__)
 
+def _compile_rule(rule: Dict) -> Optional[Callable[[np.ndarray], Dict[str, Any]]]:
+    """Compile a range or distribution rule into a check function.
+    
+    The rule's thresholds are bound once, so the returned function goes
+    straight to the numeric work instead of re-reading the rule dict and
+    dispatching on its type for every call. Results match
+    ``ModelValidator._apply_validation_rule``.
+    
+    Args:
+        rule: Dictionary containing rule definition
+        
+    Returns:
+        Function taking the outputs and returning the rule check result,
+        or None if the rule type has no compiled form
+    """
+    rule_name = rule.get("name", "unnamed_rule")
+    description = rule.get("description", "")
+    rule_type = rule.get("type", "")
+    
+    if rule_type == "range":
+        min_val, max_val = rule.get("range", (None, None))
+        if min_val is None or max_val is None:
+            return None
+        
+        def check_range(outputs: np.ndarray) -> Dict[str, Any]:
+            n_within = range_stats(outputs, min_val, max_val)[0]
+            return {
+                "rule_name": rule_name,
+                "description": description,
+                "passed": n_within == outputs.size,
+                "details": {
+                    "within_range_percentage": float(n_within / outputs.size * 100),
+                    "outliers_count": int(outputs.size - n_within)
+                }
+            }
+        return check_range
+    
+    if rule_type == "distribution":
+        expected_mean = rule.get("expected_mean")
+        expected_std = rule.get("expected_std")
+        if expected_mean is None or expected_std is None:
+            return None
+        tolerance = expected_std * 0.1
+        
+        def check_distribution(outputs: np.ndarray) -> Dict[str, Any]:
+            actual_mean = np.mean(outputs)
+            actual_std = np.std(outputs)
+            return {
+                "rule_name": rule_name,
+                "description": description,
+                "passed": (abs(actual_mean - expected_mean) <= tolerance and
+                           abs(actual_std - expected_std) <= tolerance),
+                "details": {
+                    "expected_mean": float(expected_mean),
+                    "actual_mean": float(actual_mean),
+                    "expected_std": float(expected_std),
+                    "actual_std": float(actual_std)
+                }
+            }
+        return check_distribution
+    
+    return None
+
 class HealthcareModelValidator(ModelValidator):
     """Healthcare-specific model validator."""
     
+    # Maximum number of output fingerprints whose check results are kept
+    OUTPUT_CHECK_CACHE_SIZE = 256
+    
     def __init__(self, model_name: str, model_version: str):
         """Initialize the healthcare model validator.
         
@@ -67,16 +138,31 @@ class HealthcareModelValidator(ModelValidator):
             "maximum_bias": 0.10,
             "maximum_disparity": 0.15
         }
+        
+        # Rule check functions with their thresholds bound, each paired with
+        # the serialized rule it was compiled from
+        self._compiled_rules = {}
+        self.compile_rules()
+        
+        # Pass/fail limits derived from the compliance thresholds
+        self.compile_thresholds()
+        
+        # LRU cache of rule and clinical validity results keyed by output
+        # fingerprint, for batches that revalidate identical outputs
+        self._output_check_cache = OrderedDict()
     
     def validate_healthcare_outputs(self, outputs: np.ndarray,
                                  output_type: str,
-                                 metadata: Optional[Dict] = None) -> Dict[str, Any]:
+                                 metadata: Optional[Dict] = None,
+                                 timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Validate healthcare-specific model outputs.
         
         Args:
             outputs: Model output values to validate
             output_type: Type of healthcare output (e.g., 'age', 'bmi', 'cost')
             metadata: Additional metadata about the outputs
+            timestamp: Optional ISO timestamp to record, so a batch of
+                validations can share one; defaults to the current time
             
         Returns:
             Dictionary containing healthcare-specific validation results
@@ -89,52 +175,169 @@ class HealthcareModelValidator(ModelValidator):
             raise ValueError("Empty outputs array provided")
             
         if output_type not in self.healthcare_rules:
-            raise ValueError(f"Invalid output_type: {output_type}. Must be one of: {list(self.healthcare_rules.keys())}")
+            raise ValueError(f"Invalid output_type: {output_type}. Must be one of: {self._rule_types_msg}")
             
         validation_results = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "output_type": output_type,
             "healthcare_specific_checks": []
         }
         
         try:
-            # Apply healthcare-specific rules based on output type
-            if output_type in self.healthcare_rules:
-                rule = self.healthcare_rules[output_type]
-                check_result = self._apply_validation_rule(outputs, rule)
-                validation_results["healthcare_specific_checks"].append(check_result)
+            # Rule and clinical checks depend only on the outputs, rule and
+            # metadata, so identical inputs reuse the cached results
+            rule_key = self._rule_key(self.healthcare_rules[output_type])
+            cache_key = self._output_fingerprint(outputs, output_type, metadata, rule_key)
+            cached = self._output_check_cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                self._output_check_cache.move_to_end(cache_key)
+                specific_checks, clinical_validity = copy.deepcopy(cached)
+            else:
+                # Apply healthcare-specific rules based on output type
+                specific_checks = [self._run_rule(outputs, output_type, rule_key)]
+                clinical_validity = self._check_clinical_validity(outputs, output_type, metadata)
+                
+                if cache_key is not None:
+                    self._output_check_cache[cache_key] = copy.deepcopy((specific_checks, clinical_validity))
+                    if len(self._output_check_cache) > self.OUTPUT_CHECK_CACHE_SIZE:
+                        self._output_check_cache.popitem(last=False)
+            
+            validation_results["healthcare_specific_checks"].extend(specific_checks)
             
-            # Additional healthcare-specific validations
+            # Additional healthcare-specific validations; compliance reads the
+            # validator's current metrics, so it is never served from cache
             validation_results.update({
-                "clinical_validity": self._check_clinical_validity(outputs, output_type, metadata),
+                "clinical_validity": clinical_validity,
                 "regulatory_compliance": self._check_regulatory_compliance(outputs, metadata)
             })
             
             # Store in overall validation results
             self.validation_results["healthcare_validation"] = validation_results
-            logger.info(f"Healthcare validation completed for {output_type}")
+            logger.info("Healthcare validation completed for %s", output_type)
             
             return validation_results
             
         except Exception as e:
-            logger.error(f"Error in healthcare validation: {e}")
+            logger.error("Error in healthcare validation: %s", e)
             raise
     
+    def compile_rules(self) -> None:
+        """Compile ``healthcare_rules`` into check functions.
+        
+        Called at construction. A rule edited in place afterwards is
+        recompiled on its next use; call this again after adding or
+        removing rules to refresh the error message's rule list.
+        """
+        self._compiled_rules = {}
+        for output_type, rule in self.healthcare_rules.items():
+            self._compiled_rules[output_type] = (self._rule_key(rule), _compile_rule(rule))
+        self._rule_types_msg = str(list(self.healthcare_rules))
+    
+    @staticmethod
+    def _rule_key(rule: Dict) -> Optional[str]:
+        """Serialize a rule, to tell whether it changed since it was compiled.
+        
+        Args:
+            rule: Dictionary containing rule definition
+            
+        Returns:
+            Canonical JSON of the rule, or None if it cannot be serialized
+        """
+        try:
+            return json.dumps(rule, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+    
+    def compile_thresholds(self) -> None:
+        """Derive the disparity limits from ``compliance_thresholds``.
+        
+        Called at construction; call it again after editing the thresholds.
+        """
+        self._max_allowed_disparity = 1 + self.compliance_thresholds["maximum_disparity"]
+        self._max_allowed_bias = 1 + self.compliance_thresholds["maximum_bias"]
+    
+    def _run_rule(self, outputs: np.ndarray, output_type: str,
+                  rule_key: Optional[str]) -> Dict[str, Any]:
+        """Apply the rule for an output type, using its compiled form if any.
+        
+        The compiled form is rebuilt when the rule no longer matches the
+        one it was compiled from.
+        
+        Args:
+            outputs: Model outputs to validate
+            output_type: Type of healthcare output
+            rule_key: The rule's current ``_rule_key``
+            
+        Returns:
+            Dictionary containing rule check results
+        """
+        rule = self.healthcare_rules[output_type]
+        if rule_key is None:
+            return self._apply_validation_rule(outputs, rule)
+        
+        entry = self._compiled_rules.get(output_type)
+        if entry is None or entry[0] != rule_key:
+            entry = self._compiled_rules[output_type] = (rule_key, _compile_rule(rule))
+        compiled = entry[1]
+        if compiled is None:
+            return self._apply_validation_rule(outputs, rule)
+        
+        try:
+            return compiled(np.asarray(outputs))
+        except Exception as e:
+            logger.error("Error applying validation rule: %s", e)
+            return {
+                "rule_name": rule.get("name", "unnamed_rule"),
+                "description": rule.get("description", ""),
+                "passed": False,
+                "details": {},
+                "error": str(e)
+            }
+    
+    def _output_fingerprint(self, outputs: np.ndarray, output_type: str,
+                            metadata: Optional[Dict],
+                            rule_key: Optional[str]) -> Optional[tuple]:
+        """Build the cache key for a set of outputs.
+        
+        Args:
+            outputs: Model output values
+            output_type: Type of healthcare output
+            metadata: Additional metadata about the outputs
+            rule_key: The rule's current ``_rule_key``
+            
+        Returns:
+            Hashable key, or None if the inputs cannot be fingerprinted
+        """
+        arr = np.ascontiguousarray(outputs)
+        if arr.dtype.hasobject or rule_key is None:
+            return None
+        try:
+            context = json.dumps(metadata, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        
+        # Hash the raw buffer through a byte view, without copying it
+        digest = hashlib.blake2b(arr.reshape(-1).view(np.uint8), digest_size=16).digest()
+        return (output_type, arr.dtype.str, arr.shape, digest, rule_key, context)
+    
     def analyze_healthcare_bias(self, predictions: np.ndarray,
                               sensitive_features: pd.DataFrame,
-                              target: Optional[np.ndarray] = None) -> Dict[str, Any]:
+                              target: Optional[np.ndarray] = None,
+                              timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Analyze healthcare-specific biases and disparities.
         
         Args:
             predictions: Model predictions
             sensitive_features: DataFrame containing sensitive healthcare attributes
             target: Optional ground truth values
+            timestamp: Optional ISO timestamp to record, so a batch of
+                analyses can share one; defaults to the current time
             
         Returns:
             Dictionary containing healthcare-specific bias analysis
         """
         bias_results = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "protected_attributes": {},
             "healthcare_disparities": {},
             "compliance_status": "compliant"
@@ -142,20 +345,22 @@ class HealthcareModelValidator(ModelValidator):
         
         try:
             # Analyze each protected healthcare attribute
+            present = set(sensitive_features.columns)
             for attribute in self.protected_attributes:
-                if attribute in sensitive_features.columns:
-                    # Calculate healthcare-specific disparity metrics
-                    attribute_results = self._analyze_healthcare_disparity(
-                        predictions, 
-                        sensitive_features[attribute],
-                        target
-                    )
-                    
-                    bias_results["protected_attributes"][attribute] = attribute_results
-                    
-                    # Check if any disparity exceeds compliance thresholds
-                    if attribute_results.get("disparity_ratio", 1.0) > (1 + self.compliance_thresholds["maximum_disparity"]):
-                        bias_results["compliance_status"] = "non_compliant"
+                if attribute not in present:
+                    continue
+                
+                # Calculate healthcare-specific disparity metrics
+                attribute_results = self._analyze_healthcare_disparity(
+                    predictions,
+                    sensitive_features[attribute],
+                    target
+                )
+                bias_results["protected_attributes"][attribute] = attribute_results
+                
+                # Check if any disparity exceeds compliance thresholds
+                if attribute_results.get("disparity_ratio", 1.0) > self._max_allowed_disparity:
+                    bias_results["compliance_status"] = "non_compliant"
             
             # Store in overall validation results
             self.validation_results["healthcare_bias"] = bias_results
@@ -164,7 +369,7 @@ class HealthcareModelValidator(ModelValidator):
             return bias_results
             
         except Exception as e:
-            logger.error(f"Error in healthcare bias analysis: {e}")
+            logger.error("Error in healthcare bias analysis: %s", e)
             raise
     
     def _check_clinical_validity(self, outputs: np.ndarray, 
@@ -186,19 +391,26 @@ class HealthcareModelValidator(ModelValidator):
         }
         
         try:
+            # Read the extremes once; every range rule below is decided from
+            # these two scalars instead of rescanning the array per rule
+            bounds = None
+            if output_type in ("cost", "bmi"):
+                bounds = self._output_bounds(outputs)
+                lo, hi = bounds
+            
             if output_type == "cost":
                 # Check for unrealistic cost predictions
-                if np.any(outputs < 0):
+                if lo < 0:
                     validity_results["warnings"].append("Negative cost predictions detected")
                     validity_results["clinically_valid"] = False
                 
-                if np.any(outputs > 1000000):  # Example threshold
+                if hi > 1000000:  # Example threshold
                     validity_results["warnings"].append("Extremely high cost predictions detected")
                     validity_results["clinically_valid"] = False
             
             elif output_type == "bmi":
                 # Check for physiologically impossible BMI values
-                if np.any(outputs < 10) or np.any(outputs > 60):
+                if lo < 10 or hi > 60:
                     validity_results["warnings"].append("Physiologically impossible BMI values detected")
                     validity_results["clinically_valid"] = False
             
@@ -207,16 +419,30 @@ class HealthcareModelValidator(ModelValidator):
                 validity_results["context_specific"] = self._check_context_specific_validity(
                     outputs, 
                     output_type,
-                    metadata["clinical_context"]
+                    metadata["clinical_context"],
+                    bounds
                 )
             
             return validity_results
             
         except Exception as e:
-            logger.error(f"Error in clinical validity check: {e}")
+            logger.error("Error in clinical validity check: %s", e)
             validity_results["error"] = str(e)
             return validity_results
     
+    @staticmethod
+    def _output_bounds(outputs: np.ndarray) -> tuple:
+        """Get the minimum and maximum of the outputs, ignoring NaNs.
+        
+        Args:
+            outputs: Model outputs
+            
+        Returns:
+            Tuple of (min, max)
+        """
+        _, lo, hi = range_stats(np.asarray(outputs))
+        return lo, hi
+    
     def _check_regulatory_compliance(self, outputs: np.ndarray,
                                    metadata: Optional[Dict]) -> Dict[str, Any]:
         """Check regulatory compliance of model outputs.
@@ -247,18 +473,16 @@ class HealthcareModelValidator(ModelValidator):
             # Check bias against maximum threshold
             if "bias_analysis" in self.validation_results:
                 bias_metrics = self.validation_results["bias_analysis"]
-                max_disparity = 0
-                for attribute in bias_metrics.get("group_disparities", {}):
-                    disparities = bias_metrics["group_disparities"][attribute].get("disparities", {})
-                    for metric, value in disparities.items():
-                        if "ratio" in metric and value > max_disparity:
-                            max_disparity = value
+                bias_threshold = self._max_allowed_bias
+                max_disparity, short_circuited = self._max_bias_disparity(bias_metrics, bias_threshold)
+                if short_circuited:
+                    compliance_results["short_circuited"] = True
                 
                 compliance_results["checks"].append({
                     "name": "maximum_bias",
-                    "passed": max_disparity <= (1 + self.compliance_thresholds["maximum_bias"]),
+                    "passed": max_disparity <= bias_threshold,
                     "value": max_disparity,
-                    "threshold": 1 + self.compliance_thresholds["maximum_bias"]
+                    "threshold": bias_threshold
                 })
             
             # Update overall compliance status
@@ -267,10 +491,54 @@ class HealthcareModelValidator(ModelValidator):
             return compliance_results
             
         except Exception as e:
-            logger.error(f"Error in regulatory compliance check: {e}")
+            logger.error("Error in regulatory compliance check: %s", e)
             compliance_results["error"] = str(e)
             return compliance_results
     
+    @staticmethod
+    def _max_bias_disparity(bias_metrics: Dict, bias_threshold: float) -> tuple:
+        """Find the largest disparity ratio in a bias analysis.
+        
+        The scan stops at the first ratio above ``bias_threshold``, since the
+        compliance check has failed by then. The scan covers only a few
+        attributes, so it is cheaper to repeat than to key a cache on every
+        disparity value.
+        
+        Args:
+            bias_metrics: Bias analysis results with ``group_disparities``
+            bias_threshold: Largest ratio that still passes the check
+            
+        Returns:
+            Tuple of (max_disparity, short_circuited)
+        """
+        group_disparities = bias_metrics.get("group_disparities", {})
+        ratios = (
+            value
+            for attribute_results in group_disparities.values()
+            for metric, value in attribute_results.get("disparities", {}).items()
+            if "ratio" in metric
+        )
+        max_disparity = 0
+        short_circuited = False
+        for value in ratios:
+            if value > max_disparity:
+                max_disparity = value
+                # The check has failed; the remaining attributes cannot change that
+                if max_disparity > bias_threshold:
+                    short_circuited = True
+                    break
+        
+        return max_disparity, short_circuited
+    
+    @staticmethod
+    def _is_binary_labels(values: np.ndarray) -> bool:
+        """Return True if ``values`` is a boolean or integer array of 0s and 1s."""
+        if values.dtype == np.bool_:
+            return True
+        if values.size == 0 or not np.issubdtype(values.dtype, np.integer):
+            return False
+        return values.min() >= 0 and values.max() <= 1
+    
     def _analyze_healthcare_disparity(self, predictions: np.ndarray,
                                     attribute_values: pd.Series,
                                     target: Optional[np.ndarray]) -> Dict[str, Any]:
@@ -290,61 +558,87 @@ class HealthcareModelValidator(ModelValidator):
         }
         
         try:
-            unique_groups = attribute_values.unique()
+            # Encode the groups once, in order of appearance, and reduce every
+            # per-group statistic with a weighted bincount over the codes
+            # instead of building a boolean mask per group
+            codes, unique_groups = pd.factorize(attribute_values, use_na_sentinel=False)
+            n_groups = len(unique_groups)
+            preds = np.asarray(predictions, dtype=np.float64)
+            
+            sizes = np.bincount(codes, minlength=n_groups)
+            means = np.bincount(codes, weights=preds, minlength=n_groups) / sizes
+            # Second pass over the deviations keeps the variance numerically stable
+            deviations = preds - means[codes]
+            stds = np.sqrt(np.bincount(codes, weights=deviations * deviations, minlength=n_groups) / sizes)
+            
+            if target is not None:
+                truth = np.asarray(target)
+                # Count the matching rows per group as integers instead of
+                # summing float weights built from the boolean masks
+                if self._is_binary_labels(truth):
+                    # 0/1 labels collapse to a one-byte mask that serves both
+                    # the outcome counts and the negatives
+                    positives = truth.astype(np.bool_, copy=False)
+                    outcome_rates = np.bincount(codes[positives], minlength=n_groups) / sizes
+                    negatives = ~positives
+                else:
+                    outcome_rates = np.bincount(codes, weights=truth.astype(np.float64), minlength=n_groups) / sizes
+                    negatives = truth == 0
+                negative_counts = np.bincount(codes[negatives], minlength=n_groups)
+                false_positives = np.bincount(codes[negatives & (preds == 1)], minlength=n_groups)
+                false_positive_rates = np.divide(false_positives, negative_counts,
+                                                 out=np.zeros(n_groups), where=negative_counts > 0)
+            
+            # Lay the metrics out column-wise and convert to Python floats in a
+            # single tolist() call rather than one float() per group and metric
+            metric_names = ["mean_prediction", "std_prediction"]
+            metric_columns = [means, stds]
+            if target is not None:
+                metric_names += ["outcome_rate", "prediction_rate", "false_positive_rate"]
+                metric_columns += [outcome_rates, means, false_positive_rates]
+            metric_rows = np.column_stack(metric_columns).tolist()
             
             # Calculate healthcare-specific metrics for each group
-            for group in unique_groups:
-                group_mask = attribute_values == group
-                group_preds = predictions[group_mask]
-                
-                group_metrics = {
-                    "size": int(np.sum(group_mask)),
-                    "mean_prediction": float(np.mean(group_preds)),
-                    "std_prediction": float(np.std(group_preds))
-                }
-                
-                # Add outcome metrics if target is available
-                if target is not None:
-                    group_target = target[group_mask]
-                    group_metrics.update({
-                        "outcome_rate": float(np.mean(group_target)),
-                        "prediction_rate": float(np.mean(group_preds)),
-                        "false_positive_rate": float(
-                            np.sum((group_preds == 1) & (group_target == 0)) / 
-                            np.sum(group_target == 0) if np.sum(group_target == 0) > 0 else 0
-                        )
-                    })
-                
+            for group, size, row in zip(unique_groups, sizes.tolist(), metric_rows):
+                group_metrics = {"size": size}
+                group_metrics.update(zip(metric_names, row))
                 disparity_results["groups"][str(group)] = group_metrics
             
-            # Calculate disparity metrics
-            if len(unique_groups) > 1:
-                metrics = ["mean_prediction", "prediction_rate", "false_positive_rate"]
-                for metric in metrics:
-                    values = [g.get(metric, 0) for g in disparity_results["groups"].values()]
-                    if values and not all(v == 0 for v in values):
-                        min_val = min(v for v in values if v > 0)
-                        max_val = max(values)
-                        disparity_results["disparity_metrics"][metric] = {
-                            "ratio": float(max_val / min_val) if min_val > 0 else float('inf'),
-                            "difference": float(max_val - min_val)
-                        }
+            # Calculate disparity metrics straight from the metric arrays; a
+            # metric absent without a target contributes zeros and is skipped
+            if n_groups > 1:
+                disparity_columns = {
+                    "mean_prediction": means,
+                    "prediction_rate": means if target is not None else None,
+                    "false_positive_rate": false_positive_rates if target is not None else None
+                }
+                for metric, values in disparity_columns.items():
+                    if values is None or not np.any(values):
+                        continue
+                    min_val = values[values > 0].min()
+                    max_val = values.max()
+                    disparity_results["disparity_metrics"][metric] = {
+                        "ratio": float(max_val / min_val) if min_val > 0 else float('inf'),
+                        "difference": float(max_val - min_val)
+                    }
             
             return disparity_results
             
         except Exception as e:
-            logger.error(f"Error in healthcare disparity analysis: {e}")
+            logger.error("Error in healthcare disparity analysis: %s", e)
             return {"error": str(e)}
     
     def _check_context_specific_validity(self, outputs: np.ndarray,
                                        output_type: str,
-                                       clinical_context: Dict) -> Dict[str, Any]:
+                                       clinical_context: Dict,
+                                       bounds: Optional[tuple] = None) -> Dict[str, Any]:
         """Check validity in specific clinical contexts.
         
         Args:
             outputs: Model outputs to validate
             output_type: Type of healthcare output
             clinical_context: Dictionary containing clinical context
+            bounds: Optional precomputed (min, max) of the outputs
             
         Returns:
             Dictionary containing context-specific validity results
@@ -360,7 +654,11 @@ class HealthcareModelValidator(ModelValidator):
                 # Stricter thresholds for emergency settings
                 if output_type == "cost":
                     high_cost_threshold = clinical_context.get("high_cost_threshold", 50000)
-                    high_cost_predictions = np.sum(outputs > high_cost_threshold)
+                    # Only count exceedances when the maximum says there are any
+                    if bounds is not None and bounds[1] <= high_cost_threshold:
+                        high_cost_predictions = 0
+                    else:
+                        high_cost_predictions = np.sum(outputs > high_cost_threshold)
                     if high_cost_predictions > 0:
                         context_results["context_specific_warnings"].append(
                             f"{high_cost_predictions} predictions exceed emergency cost threshold"
@@ -370,7 +668,8 @@ class HealthcareModelValidator(ModelValidator):
                 # Special checks for pediatric populations
                 if output_type == "bmi":
                     # Use pediatric-specific BMI ranges
-                    if np.any(outputs > 40):
+                    max_bmi = bounds[1] if bounds is not None else self._output_bounds(outputs)[1]
+                    if max_bmi > 40:
                         context_results["context_specific_warnings"].append(
                             "Extremely high BMI predictions for pediatric population"
                         )
@@ -379,6 +678,6 @@ class HealthcareModelValidator(ModelValidator):
             return context_results
             
         except Exception as e:
-            logger.error(f"Error in context-specific validity check: {e}")
+            logger.error("Error in context-specific validity check: %s", e)
             context_results["error"] = str(e)
             return context_results
\ No newline at end of file
@@ -12,13 +12,10 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Union, Any
 from datetime import datetime
-import json
 import logging
+import orjson
 from pathlib import Path
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    roc_auc_score, confusion_matrix
-)
+from ._range_kernels import range_stats
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +28,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _json_default(obj: Any) -> Any:
+    """Convert numpy values orjson does not serialize natively.
+    
+    Args:
+        obj: Object orjson could not serialize
+        
+    Returns:
+        Equivalent native Python value
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class ModelValidator:
     """Base class for AI model validation."""
     
@@ -52,6 +64,10 @@ class ModelValidator:
             "bias_analysis": {},
             "performance_comparison": {}
         }
+        
+        # Running confusion matrix and its sorted labels for update/finalize
+        self._confusion = None
+        self._confusion_labels = None
     
     def validate_performance(self, y_true: np.ndarray, y_pred: np.ndarray, 
                            y_prob: Optional[np.ndarray] = None) -> Dict[str, float]:
@@ -65,22 +81,21 @@ class ModelValidator:
         Returns:
             Dictionary containing performance metrics
         """
+        # sklearn is imported on first use; it is slow to load and not
+        # needed for output validation or version comparison
+        from sklearn.metrics import roc_auc_score, confusion_matrix
+        
         metrics = {}
         
         try:
-            # Basic classification metrics
-            metrics["accuracy"] = float(accuracy_score(y_true, y_pred))
-            metrics["precision"] = float(precision_score(y_true, y_pred, average='weighted'))
-            metrics["recall"] = float(recall_score(y_true, y_pred, average='weighted'))
-            metrics["f1"] = float(f1_score(y_true, y_pred, average='weighted'))
+            # Basic classification metrics and the confusion matrix, all
+            # derived from one confusion matrix pass
+            metrics.update(self._metrics_from_confusion_matrix(confusion_matrix(y_true, y_pred)))
             
             # Add ROC AUC if probabilities are provided
             if y_prob is not None:
                 metrics["roc_auc"] = float(roc_auc_score(y_true, y_prob, multi_class='ovr'))
             
-            # Add confusion matrix
-            metrics["confusion_matrix"] = confusion_matrix(y_true, y_pred).tolist()
-            
             # Store metrics in validation results
             self.validation_results["metrics"] = metrics
             logger.info(f"Performance validation completed for {self.model_name} v{self.model_version}")
@@ -91,6 +106,102 @@ class ModelValidator:
             logger.error(f"Error in performance validation: {e}")
             raise
     
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        """Accumulate a batch of labels for streaming performance validation.
+        
+        Only the confusion matrix is kept between batches, so memory grows
+        with the number of classes rather than the number of samples. Call
+        ``finalize`` once every batch has been added.
+        
+        Args:
+            y_true: Ground truth labels for the batch
+            y_pred: Predicted labels for the batch
+        """
+        from sklearn.metrics import confusion_matrix
+        from sklearn.utils.multiclass import unique_labels
+        
+        batch_labels = unique_labels(y_true, y_pred)
+        if self._confusion is None:
+            labels = batch_labels
+        else:
+            labels = np.union1d(self._confusion_labels, batch_labels)
+        
+        batch_confusion = confusion_matrix(y_true, y_pred, labels=labels)
+        if self._confusion is not None:
+            # Place the running counts at their rows/columns in the new label set
+            positions = np.searchsorted(labels, self._confusion_labels)
+            batch_confusion[np.ix_(positions, positions)] += self._confusion
+        
+        self._confusion = batch_confusion
+        self._confusion_labels = labels
+    
+    def finalize(self) -> Dict[str, Any]:
+        """Derive performance metrics from the batches passed to ``update``.
+        
+        The metrics match ``validate_performance`` without ROC AUC, which
+        needs every probability at once. The accumulator is reset so a new
+        stream can start.
+        
+        Returns:
+            Dictionary containing performance metrics
+        """
+        if self._confusion is None:
+            raise ValueError("No batches have been added with update()")
+        
+        metrics = self._metrics_from_confusion_matrix(self._confusion)
+        self._confusion = None
+        self._confusion_labels = None
+        
+        # Store metrics in validation results
+        self.validation_results["metrics"] = metrics
+        logger.info(f"Performance validation completed for {self.model_name} v{self.model_version}")
+        
+        return metrics
+    
+    @staticmethod
+    def _metrics_from_confusion_matrix(cm: np.ndarray) -> Dict[str, Any]:
+        """Compute accuracy and weighted precision, recall and F1.
+        
+        Scores follow sklearn's weighted averages with ``zero_division=0``:
+        per-class scores that are undefined count as 0, and classes are
+        weighted by their support.
+        
+        Args:
+            cm: Confusion matrix with true labels on rows
+            
+        Returns:
+            Dictionary containing the metrics and the confusion matrix
+            
+        Raises:
+            ValueError: If the confusion matrix counts no samples
+        """
+        # sklearn's confusion_matrix accepts empty input, which would leave
+        # every metric below dividing by zero
+        n_samples = cm.sum()
+        if n_samples == 0:
+            raise ValueError("Found array with 0 sample(s); at least one is required")
+        
+        true_positives = np.diag(cm).astype(np.float64)
+        support = cm.sum(axis=1)
+        predicted = cm.sum(axis=0)
+        
+        precision = np.divide(true_positives, predicted,
+                              out=np.zeros_like(true_positives), where=predicted > 0)
+        recall = np.divide(true_positives, support,
+                           out=np.zeros_like(true_positives), where=support > 0)
+        denom = precision + recall
+        undefined = np.isclose(denom, 0) | np.isclose(predicted + support, 0)
+        f1 = np.divide(2 * precision * recall, denom,
+                       out=np.zeros_like(true_positives), where=~undefined)
+        
+        return {
+            "accuracy": float(np.trace(cm) / n_samples),
+            "precision": float(np.average(precision, weights=support)),
+            "recall": float(np.average(recall, weights=support)),
+            "f1": float(np.average(f1, weights=support)),
+            "confusion_matrix": cm.tolist()
+        }
+    
     def validate_outputs(self, outputs: np.ndarray, 
                         expected_range: Optional[tuple] = None,
                         validation_rules: Optional[List[Dict]] = None) -> Dict[str, Any]:
@@ -111,22 +222,33 @@ class ModelValidator:
         }
         
         try:
+            outputs = np.asarray(outputs)
+            # One pass yields the extremes and, when a range is given, the
+            # count inside it, instead of separate min/max/mask scans
+            min_val, max_val = expected_range if expected_range else (-np.inf, np.inf)
+            n_within, output_min, output_max = range_stats(outputs, min_val, max_val)
+            
+            # range_stats skips NaNs, but mean, std and median propagate them;
+            # report NaN extremes too so the statistics share one NaN policy.
+            # A NaN mean flags the case without scanning for NaNs every time.
+            output_mean = np.mean(outputs)
+            if np.isnan(output_mean) and np.isnan(outputs).any():
+                output_min = output_max = np.nan
+            
             # Basic statistical checks
             validation_results["statistics"] = {
-                "mean": float(np.mean(outputs)),
+                "mean": float(output_mean),
                 "std": float(np.std(outputs)),
-                "min": float(np.min(outputs)),
-                "max": float(np.max(outputs)),
+                "min": float(output_min),
+                "max": float(output_max),
                 "median": float(np.median(outputs))
             }
             
             # Range validation if provided
             if expected_range:
-                min_val, max_val = expected_range
-                within_range = np.logical_and(outputs >= min_val, outputs <= max_val)
                 validation_results["range_check"] = {
-                    "within_range_percentage": float(np.mean(within_range) * 100),
-                    "outliers_count": int(np.sum(~within_range))
+                    "within_range_percentage": float(n_within / outputs.size * 100),
+                    "outliers_count": int(outputs.size - n_within)
                 }
             
             # Custom validation rules
@@ -164,30 +286,60 @@ class ModelValidator:
         }
         
         try:
+            preds = np.asarray(predictions)
+            preds_float = preds.astype(np.float64, copy=False)
+            if target is not None:
+                from sklearn.utils.multiclass import unique_labels
+                
+                # Encode both label arrays against their sorted union once;
+                # unique_labels also rejects continuous targets as sklearn would
+                labels = unique_labels(target, preds)
+                n_labels = len(labels)
+                true_codes = np.searchsorted(labels, target)
+                pair_codes = true_codes * n_labels + np.searchsorted(labels, preds)
+            
             # Analyze each sensitive feature
             for column in sensitive_features.columns:
                 group_metrics = {}
-                unique_groups = sensitive_features[column].unique()
+                # Group codes in order of appearance; every per-group metric
+                # below is a bincount over them rather than a pass per group
+                codes, unique_groups = pd.factorize(sensitive_features[column], use_na_sentinel=False)
+                n_groups = len(unique_groups)
+                
+                sizes = np.bincount(codes, minlength=n_groups)
+                means = np.bincount(codes, weights=preds_float, minlength=n_groups) / sizes
+                deviations = preds_float - means[codes]
+                stds = np.sqrt(np.bincount(codes, weights=deviations * deviations, minlength=n_groups) / sizes)
+                metric_names = ["mean_prediction", "std_prediction"]
+                metric_columns = [means, stds]
+                
+                # Add fairness metrics if target is provided
+                if target is not None:
+                    # Per-group confusion matrices, indexed [group, true, predicted]
+                    cm = np.bincount(codes * n_labels * n_labels + pair_codes,
+                                     minlength=n_groups * n_labels * n_labels)
+                    cm = cm.reshape(n_groups, n_labels, n_labels)
+                    true_positives = np.diagonal(cm, axis1=1, axis2=2)
+                    support = cm.sum(axis=2)
+                    predicted = cm.sum(axis=1)
+                    # Weighted precision/recall as in sklearn: per-label scores
+                    # (0 where undefined) averaged with the label support
+                    label_precision = np.divide(true_positives, predicted,
+                                                out=np.zeros(true_positives.shape), where=predicted > 0)
+                    label_recall = np.divide(true_positives, support,
+                                             out=np.zeros(true_positives.shape), where=support > 0)
+                    metric_names += ["accuracy", "precision", "recall"]
+                    metric_columns += [
+                        true_positives.sum(axis=1) / sizes,
+                        (label_precision * support).sum(axis=1) / sizes,
+                        (label_recall * support).sum(axis=1) / sizes
+                    ]
                 
                 # Calculate prediction statistics per group
-                for group in unique_groups:
-                    group_mask = sensitive_features[column] == group
-                    group_preds = predictions[group_mask]
-                    
-                    group_metrics[str(group)] = {
-                        "size": int(np.sum(group_mask)),
-                        "mean_prediction": float(np.mean(group_preds)),
-                        "std_prediction": float(np.std(group_preds))
-                    }
-                    
-                    # Add fairness metrics if target is provided
-                    if target is not None:
-                        group_target = target[group_mask]
-                        group_metrics[str(group)].update({
-                            "accuracy": float(accuracy_score(group_target, group_preds)),
-                            "precision": float(precision_score(group_target, group_preds, average='weighted')),
-                            "recall": float(recall_score(group_target, group_preds, average='weighted'))
-                        })
+                metric_rows = np.column_stack(metric_columns).tolist()
+                for group, size, row in zip(unique_groups, sizes.tolist(), metric_rows):
+                    group_metrics[str(group)] = {"size": size}
+                    group_metrics[str(group)].update(zip(metric_names, row))
                 
                 # Calculate disparities between groups
                 disparities = self._calculate_group_disparities(group_metrics)
@@ -229,23 +381,31 @@ class ModelValidator:
             base_metrics = self.validation_results.get("metrics", {})
             other_metrics = other_version_results.get("metrics", {})
             
-            for metric in base_metrics:
-                if metric in other_metrics:
-                    delta = base_metrics[metric] - other_metrics[metric]
-                    delta_percentage = (delta / other_metrics[metric]) * 100 if other_metrics[metric] != 0 else float('inf')
-                    
-                    comparison_results["metric_deltas"][metric] = {
-                        "absolute_change": float(delta),
-                        "percentage_change": float(delta_percentage)
-                    }
-                    
-                    # Flag significant changes (>5% change)
-                    if abs(delta_percentage) > 5:
-                        comparison_results["significant_changes"].append({
-                            "metric": metric,
-                            "change": float(delta_percentage),
-                            "severity": "high" if abs(delta_percentage) > 10 else "medium"
-                        })
+            # Scalar metrics present in both versions; non-scalar entries
+            # such as the confusion matrix have no single delta
+            common = [metric for metric, value in base_metrics.items()
+                      if isinstance(value, (int, float, np.number)) and
+                      isinstance(other_metrics.get(metric), (int, float, np.number))]
+            base_values = np.array([base_metrics[metric] for metric in common], dtype=np.float64)
+            other_values = np.array([other_metrics[metric] for metric in common], dtype=np.float64)
+            
+            deltas = base_values - other_values
+            with np.errstate(divide='ignore', invalid='ignore'):
+                delta_percentages = np.where(other_values != 0, deltas / other_values * 100, np.inf)
+            
+            comparison_results["metric_deltas"] = {
+                metric: {"absolute_change": delta, "percentage_change": delta_percentage}
+                for metric, delta, delta_percentage in zip(common, deltas.tolist(), delta_percentages.tolist())
+            }
+            
+            # Flag significant changes (>5% change)
+            magnitudes = np.abs(delta_percentages)
+            for i in np.flatnonzero(magnitudes > 5):
+                comparison_results["significant_changes"].append({
+                    "metric": common[i],
+                    "change": float(delta_percentages[i]),
+                    "severity": "high" if magnitudes[i] > 10 else "medium"
+                })
             
             # Store in overall validation results
             self.validation_results["performance_comparison"] = comparison_results
@@ -280,12 +440,13 @@ class ModelValidator:
             if rule_type == "range":
                 min_val, max_val = rule.get("range", (None, None))
                 if min_val is not None and max_val is not None:
-                    within_range = np.logical_and(outputs >= min_val, outputs <= max_val)
+                    outputs = np.asarray(outputs)
+                    n_within = range_stats(outputs, min_val, max_val)[0]
                     check_result.update({
-                        "passed": np.all(within_range),
+                        "passed": n_within == outputs.size,
                         "details": {
-                            "within_range_percentage": float(np.mean(within_range) * 100),
-                            "outliers_count": int(np.sum(~within_range))
+                            "within_range_percentage": float(n_within / outputs.size * 100),
+                            "outliers_count": int(outputs.size - n_within)
                         }
                     })
             
@@ -332,15 +493,22 @@ class ModelValidator:
             first_group = next(iter(group_metrics.values()))
             metric_names = [k for k in first_group.keys() if isinstance(first_group[k], (int, float))]
             
+            # Lay the metrics out as a (groups, metrics) array; a group
+            # missing a metric gets NaN so it drops out of the reductions
+            values = np.array([[g.get(metric, np.nan) for metric in metric_names]
+                               for g in group_metrics.values()], dtype=np.float64)
+            
             # Calculate max disparity for each metric
-            for metric in metric_names:
-                values = [g[metric] for g in group_metrics.values() if metric in g]
-                if values:
-                    min_val = min(values)
-                    max_val = max(values)
-                    # Calculate disparity ratio (max/min) and difference (max-min)
-                    disparities[f"{metric}_ratio"] = float(max_val / min_val) if min_val != 0 else float('inf')
-                    disparities[f"{metric}_difference"] = float(max_val - min_val)
+            min_vals = np.nanmin(values, axis=0)
+            max_vals = np.nanmax(values, axis=0)
+            # Calculate disparity ratio (max/min) and difference (max-min)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratios = np.where(min_vals != 0, max_vals / min_vals, np.inf)
+            differences = max_vals - min_vals
+            
+            for metric, ratio, difference in zip(metric_names, ratios.tolist(), differences.tolist()):
+                disparities[f"{metric}_ratio"] = ratio
+                disparities[f"{metric}_difference"] = difference
             
             return disparities
             
@@ -365,28 +533,12 @@ class ModelValidator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{output_dir}/{self.model_name}_{self.model_version}_{timestamp}.json"
             
-            # Convert numpy types and other non-serializable objects to Python native types
-            def convert_to_serializable(obj):
-                if isinstance(obj, np.ndarray):
-                    return obj.tolist()
-                elif isinstance(obj, np.integer):
-                    return int(obj)
-                elif isinstance(obj, np.floating):
-                    return float(obj)
-                elif isinstance(obj, (np.bool_, bool)):
-                    return bool(obj)
-                elif isinstance(obj, dict):
-                    return {k: convert_to_serializable(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_to_serializable(i) for i in obj]
-                return obj
-            
-            # Convert results to serializable format
-            serializable_results = convert_to_serializable(self.validation_results)
-            
-            # Save results
-            with open(filename, 'w') as f:
-                json.dump(serializable_results, f, indent=2)
+            # orjson serializes numpy arrays and scalars natively in one pass;
+            # anything it does not cover goes through _json_default
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.validation_results, default=_json_default,
+                                     option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                                     | orjson.OPT_INDENT_2))
             
             logger.info(f"Validation results saved to {filename}")
             return filename
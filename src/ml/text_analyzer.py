@@ -4,26 +4,65 @@ Healthcare text analysis utilities.
 Author: Robert Torres
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Tuple, Union
+from collections import Counter
 import re
-import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import classification_report, accuracy_score
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# TF-IDF settings for the trained vocabulary and for one-off text analysis
+_TFIDF_PARAMS = {'stop_words': 'english', 'max_features': 1000, 'ngram_range': (1, 2)}
+
+# Hashed feature space used when training in streaming mode
+HASHING_FEATURES = 2 ** 18
+
+# Words dropped during preprocessing
+_STOPWORDS = frozenset({'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for',
+                        'from', 'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on',
+                        'that', 'the', 'to', 'was', 'were', 'will', 'with'})
+
+# Special characters and numbers removed during preprocessing
+_NONALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+
+# Punctuation removed before word counting
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Basic medical term patterns: inflammation conditions (-itis), tumors
+# (-oma), medical conditions (-osis) and blood conditions (-emia), fused
+# into one alternation so the text is scanned once
+_MEDICAL_TERM_RE = re.compile(r'\b[A-Z][a-z]+(?:itis|oma|osis|emia)\b')
 
 
 class HealthcareTextAnalyzer:
     """Analyzer for healthcare-related text data."""
 
-    def __init__(self):
-        """Initialize the analyzer."""
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=1000,
-            ngram_range=(1, 2)
-        )
+    def __init__(self, streaming: bool = False):
+        """
+        Initialize the analyzer.
+
+        Args:
+            streaming: Hash features instead of fitting a TF-IDF vocabulary,
+                so training can run batch by batch with ``partial_train``
+                and no training texts are retained
+        """
+        # sklearn is imported here rather than at module level so that
+        # importing src.ml does not pay for loading it
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.preprocessing import LabelEncoder
+        
+        self.streaming = streaming
+        if streaming:
+            self.vectorizer = HashingVectorizer(
+                stop_words='english',
+                n_features=HASHING_FEATURES,
+                alternate_sign=False,
+                ngram_range=(1, 2)
+            )
+        else:
+            self.vectorizer = TfidfVectorizer(**_TFIDF_PARAMS)
         self.classifier = MultinomialNB()
         self.label_encoder = LabelEncoder()
         self.is_trained = False
@@ -43,22 +82,31 @@ class HealthcareTextAnalyzer:
         text = text.lower()
         
         # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = _NONALPHA_RE.sub('', text)
         
         # Convert to list of words
         words = text.split()
         
         # Remove stopwords
-        stop_words = set(['a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for',
-                         'from', 'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on',
-                         'that', 'the', 'to', 'was', 'were', 'will', 'with'])
-        words = [w for w in words if w.lower() not in stop_words]
+        words = [w for w in words if w not in _STOPWORDS]
         
         # Join words back together
         text = ' '.join(words)
         
         return text
 
+    def _preprocess_batch(self, texts: Iterable[str]) -> List[str]:
+        """
+        Preprocess a batch of texts, applying ``preprocess_text`` to each.
+
+        Args:
+            texts: Raw texts to process, in any iterable
+
+        Returns:
+            Preprocessed texts
+        """
+        return [self.preprocess_text(text) for text in texts]
+
     def train(self, texts: List[str], labels: List[str]) -> None:
         """
         Train the text analyzer.
@@ -67,8 +115,17 @@ class HealthcareTextAnalyzer:
             texts: List of training texts
             labels: List of corresponding labels
         """
+        if self.streaming:
+            from sklearn.naive_bayes import MultinomialNB
+            
+            # Start from a fresh model and treat the corpus as one batch
+            self.classifier = MultinomialNB()
+            self.is_trained = False
+            self.partial_train(texts, labels, classes=labels)
+            return
+        
         # Preprocess texts
-        processed_texts = [self.preprocess_text(text) for text in texts]
+        processed_texts = self._preprocess_batch(texts)
         
         # Transform texts to TF-IDF features
         X = self.vectorizer.fit_transform(processed_texts)
@@ -77,12 +134,43 @@ class HealthcareTextAnalyzer:
         y = self.label_encoder.fit_transform(labels)
         
         # Store training data and labels
-        self.texts = [self.preprocess_text(text) for text in texts]
+        self.texts = processed_texts
         self.labels = labels  # Keep original labels for metrics
+        # Training features and encoded labels, reused by get_metrics
+        self._X_train = X
+        self._y_train = y
+        self._y_train_pred = None
+        # Vocabulary terms, materialized once per fit
+        self._feature_names = self.vectorizer.get_feature_names_out()
         self.unique_labels = list(set(labels))
         self.pipeline = self.classifier.fit(X, y)
         self.is_trained = True
 
+    def partial_train(self, texts: List[str], labels: List[str],
+                      classes: List[str] = None) -> None:
+        """
+        Train a streaming analyzer on one batch of texts.
+
+        Args:
+            texts: Batch of training texts
+            labels: Labels of the batch
+            classes: Every label the model will see; required on the first call
+        """
+        if not self.streaming:
+            raise ValueError("partial_train requires an analyzer created with streaming=True")
+        if not self.is_trained:
+            if classes is None:
+                raise ValueError("classes must be given on the first partial_train call")
+            self.label_encoder.fit(classes)
+            self.unique_labels = list(self.label_encoder.classes_)
+        
+        X = self.vectorizer.transform(self._preprocess_batch(texts))
+        y = self.label_encoder.transform(labels)
+        self.pipeline = self.classifier.partial_fit(
+            X, y, classes=np.arange(len(self.label_encoder.classes_))
+        )
+        self.is_trained = True
+
     def predict(self, texts: List[str]) -> List[str]:
         """
         Predict labels for texts.
@@ -96,33 +184,40 @@ class HealthcareTextAnalyzer:
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
             
-        processed_texts = [self.preprocess_text(text) for text in texts]
+        processed_texts = self._preprocess_batch(texts)
         X = self.vectorizer.transform(processed_texts)
         y_pred = self.classifier.predict(X)
         return self.label_encoder.inverse_transform(y_pred)
 
-    def predict_proba(self, texts: List[str]) -> List[Dict[str, float]]:
+    def predict_proba(self, texts: List[str],
+                      as_dataframe: bool = False) -> Union[List[Dict[str, float]], 'pd.DataFrame']:
         """
         Get prediction probabilities for texts.
 
         Args:
             texts: List of texts to classify
+            as_dataframe: Return one row per text and one column per label
+                instead of a dictionary per text
 
         Returns:
-            List of dictionaries mapping labels to probabilities
+            List of dictionaries mapping labels to probabilities, or a
+            DataFrame of the same values
         """
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
             
-        processed_texts = [self.preprocess_text(text) for text in texts]
+        processed_texts = self._preprocess_batch(texts)
         X = self.vectorizer.transform(processed_texts)
         probas = self.classifier.predict_proba(X)
         
-        results = []
-        labels = self.label_encoder.classes_
-        for proba in probas:
-            results.append(dict(zip(labels, proba)))
-        return results
+        if as_dataframe:
+            import pandas as pd
+            
+            return pd.DataFrame(probas, columns=self.label_encoder.classes_)
+        
+        # Convert the whole matrix to Python floats at once
+        labels = self.label_encoder.classes_.tolist()
+        return [dict(zip(labels, row)) for row in probas.tolist()]
 
     def extract_keywords(self, text: str, top_n: int = 10) -> List[Tuple[str, float]]:
         """
@@ -135,41 +230,76 @@ class HealthcareTextAnalyzer:
         Returns:
             List of (keyword, importance_score) tuples
         """
+        if self.streaming:
+            raise ValueError("Keyword extraction needs a TF-IDF vocabulary, "
+                             "which streaming analyzers do not keep")
         processed_text = self.preprocess_text(text)
         X = self.vectorizer.transform([processed_text])
         
-        feature_names = self.vectorizer.get_feature_names_out()
-        importance_scores = X.toarray()[0]
+        feature_names = self._feature_names
+        # Only the terms present in the text have a score; rank those in
+        # the sparse row instead of densifying the whole vocabulary
+        scores = X.data
+        term_indices = X.indices
         
         # Get top n keywords by TF-IDF score
-        top_indices = np.argsort(importance_scores)[-top_n:][::-1]
-        return [(feature_names[i], importance_scores[i]) for i in top_indices]
+        if len(scores) > top_n:
+            top = np.argpartition(-scores, top_n)[:top_n]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(feature_names[term_indices[i]], scores[i]) for i in top]
 
-    def get_metrics(self) -> Dict[str, float]:
+    def get_metrics(self, texts: List[str] = None,
+                    labels: List[str] = None) -> Dict[str, float]:
         """
         Get model performance metrics.
 
+        Args:
+            texts: Optional evaluation texts; required in streaming mode,
+                where training texts are not kept
+            labels: Labels of the evaluation texts
+
         Returns:
             Dictionary containing model metrics
         """
         if not self.is_trained:
             raise ValueError("Model must be trained before getting metrics")
-            
-        # Get predictions on training data
-        X = self.vectorizer.transform(self.texts)
-        y_true = self.label_encoder.transform(self.labels)
-        y_pred = self.classifier.predict(X)
+        
+        from sklearn.metrics import classification_report, accuracy_score
+        
+        if texts is not None:
+            X = self.vectorizer.transform(self._preprocess_batch(texts))
+            y_true = self.label_encoder.transform(labels)
+            y_pred = self.classifier.predict(X)
+        elif self.streaming:
+            raise ValueError("Streaming analyzers need evaluation texts and labels")
+        else:
+            # Get predictions on training data, once per training run
+            if self._y_train_pred is None:
+                self._y_train_pred = self.classifier.predict(self._X_train)
+            y_true = self._y_train
+            y_pred = self._y_train_pred
+            labels = self.labels
         
         # Calculate metrics
         accuracy = accuracy_score(y_true, y_pred)
         report = classification_report(y_true, y_pred,
+                                    labels=np.arange(len(self.label_encoder.classes_)),
                                     target_names=self.label_encoder.classes_,
                                     output_dict=True)
         
+        if self.streaming:
+            # Hashed features have no vocabulary
+            num_features, vocab_size = self.vectorizer.n_features, None
+        else:
+            num_features = len(self._feature_names)
+            vocab_size = len(self.vectorizer.vocabulary_)
+        
         return {
-            'num_features': len(self.vectorizer.get_feature_names_out()),
-            'num_classes': len(self.labels),
-            'vocab_size': len(self.vectorizer.vocabulary_),
+            'num_features': num_features,
+            'num_classes': len(labels),
+            'vocab_size': vocab_size,
             'accuracy': float(accuracy),
             'classification_report': report
         }
@@ -186,21 +316,33 @@ class HealthcareTextAnalyzer:
         """
         # Basic text cleaning
         text = text.lower()
-        text = re.sub(r'[^\w\s]', '', text)
+        text = _PUNCT_RE.sub('', text)
         
         # Get word frequencies
+        import pandas as pd
+        
         words = text.split()
         word_freq = pd.Series(words).value_counts()
         
-        # Get TF-IDF features
-        tfidf = self.vectorizer.fit_transform([text])
-        feature_names = self.vectorizer.get_feature_names_out()
+        # Get TF-IDF features; score against the trained vocabulary, or
+        # fit a one-off vectorizer so the trained one is untouched
+        if self.is_trained and not self.streaming:
+            tfidf = self.vectorizer.transform([text])
+            feature_names = self._feature_names
+        else:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            
+            vectorizer = TfidfVectorizer(**_TFIDF_PARAMS)
+            tfidf = vectorizer.fit_transform([text])
+            feature_names = vectorizer.get_feature_names_out()
+        # Read the scored terms from the sparse row in vocabulary order
+        tfidf.sort_indices()
         
         return {
             'word_count': len(words),
             'unique_words': len(word_freq),
             'top_words': word_freq.head(10).to_dict(),
-            'key_terms': dict(zip(feature_names, tfidf.toarray()[0]))
+            'key_terms': dict(zip(feature_names[tfidf.indices], tfidf.data))
         }
     
     def extract_medical_terms(self, text: str) -> List[str]:
@@ -213,20 +355,7 @@ class HealthcareTextAnalyzer:
         Returns:
             List of identified medical terms
         """
-        # Basic medical term patterns
-        patterns = [
-            r'\b[A-Z][a-z]+itis\b',  # Inflammation conditions
-            r'\b[A-Z][a-z]+oma\b',   # Tumors
-            r'\b[A-Z][a-z]+osis\b',  # Medical conditions
-            r'\b[A-Z][a-z]+emia\b',  # Blood conditions
-        ]
-        
-        medical_terms = []
-        for pattern in patterns:
-            matches = re.finditer(pattern, text)
-            medical_terms.extend([m.group() for m in matches])
-        
-        return list(set(medical_terms))
+        return list(set(_MEDICAL_TERM_RE.findall(text)))
     
     def analyze_clinical_notes(self, notes: List[str]) -> Dict[str, Any]:
         """
@@ -238,20 +367,21 @@ class HealthcareTextAnalyzer:
         Returns:
             Dictionary containing analysis results
         """
-        all_words = []
-        all_medical_terms = []
+        word_freq = Counter()
+        term_freq = Counter()
+        total_words = 0
         
         for note in notes:
             words = note.lower().split()
-            all_words.extend(words)
-            all_medical_terms.extend(self.extract_medical_terms(note))
-        
-        word_freq = pd.Series(all_words).value_counts()
-        term_freq = pd.Series(all_medical_terms).value_counts()
+            word_freq.update(words)
+            # Same terms as extract_medical_terms, counted once per note,
+            # without building the intermediate list
+            term_freq.update(set(_MEDICAL_TERM_RE.findall(note)))
+            total_words += len(words)
         
         return {
             'total_notes': len(notes),
-            'avg_length': np.mean([len(note.split()) for note in notes]),
-            'common_words': word_freq.head(20).to_dict(),
-            'medical_terms': term_freq.to_dict()
-        }
\ No newline at end of file
+            'avg_length': total_words / len(notes) if notes else np.nan,
+            'common_words': dict(word_freq.most_common(20)),
+            'medical_terms': dict(term_freq.most_common())
+        }
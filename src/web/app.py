@@ -1,53 +1,250 @@
 """Flask web application for healthcare data quality dashboard."""
 
 import os
-import json
+import sys
+import asyncio
+import heapq
+import orjson
 import sqlite3
+import time
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request, flash, redirect, url_for
-from dotenv import load_dotenv
+from flask import Flask, g, render_template, jsonify, request, flash, redirect, url_for
 
-# Load environment variables
-load_dotenv()
+# Add the project root to the path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import config
 
 app = Flask(__name__)
-app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev')
+app.secret_key = config.secret_key
+
+# Get database path from the environment-backed config
+DB_PATH = config.db_path
+
+# Per-connection settings for the read-mostly dashboard: NORMAL sync is
+# safe under WAL, and temp tables, page cache (20 MB) and mmap (256 MB)
+# keep aggregate queries in memory
+SQLITE_PRAGMAS = (
+    'synchronous=NORMAL',
+    'temp_store=MEMORY',
+    'cache_size=-20000',
+    'mmap_size=268435456'
+)
+
+# Indexes behind the table_detail aggregates: regions are grouped straight
+# from a narrow index, and the charges statistics read one instead of the
+# full rows. Keyed by the table they require.
+DASHBOARD_INDEXES = (
+    ('patients', 'CREATE INDEX IF NOT EXISTS ix_patients_region ON patients (region)'),
+    ('insurance_charges', 'CREATE INDEX IF NOT EXISTS ix_ic_charges ON insurance_charges (charges)')
+)
+
+# WAL and the indexes are properties of the database file, so they only
+# need setting up once
+_db_initialized = False
+
+# Directory the quality check runner writes its JSON results to
+QUALITY_RESULTS_DIR = 'data/quality_results'
+
+# Seconds a cached dashboard value is reused, even if its source is unchanged
+DASHBOARD_CACHE_TTL = 30.0
+
+# Cached dashboard values keyed by name: (source version, expiry time, value)
+_dashboard_cache = {}
+
+# Fields of a quality result shown by the listing pages
+RESULT_SUMMARY_FIELDS = ('check_name', 'table', 'status', 'timestamp')
+
+# Quality result summaries keyed by filename: (file mtime, summary)
+_result_cache = {}
+
+# Dashboard queries, shared by every request so sqlite3's per-connection
+# statement cache can reuse their compiled form
+_SQL_TABLE_COUNTS = '''
+    SELECT 'patients' as table_name, COUNT(*) as count FROM patients
+    UNION ALL
+    SELECT 'insurance_charges', COUNT(*) FROM insurance_charges
+'''
 
-# Get database path from environment
-DB_PATH = os.getenv('DB_PATH', 'data/db/healthcare.db')
+# Row and column counts for both tables in a single statement;
+# pragma_table_info counts columns without materializing their metadata
+_SQL_TABLE_INFO = '''
+    SELECT 'patients' as name,
+           (SELECT COUNT(*) FROM patients) as count,
+           (SELECT COUNT(*) FROM pragma_table_info('patients')) as columns
+    UNION ALL
+    SELECT 'insurance_charges',
+           (SELECT COUNT(*) FROM insurance_charges),
+           (SELECT COUNT(*) FROM pragma_table_info('insurance_charges'))
+'''
+
+# Patient statistics and the region distribution in one round trip, each
+# returned as a JSON document shaped like the rows the template expects
+_SQL_PATIENT_STATS = '''
+    SELECT
+        (SELECT json_object(
+            'total_patients', COUNT(*),
+            'avg_age', AVG(age),
+            'avg_bmi', AVG(bmi),
+            'total_children', SUM(children),
+            'smoker_count', COALESCE(SUM(smoker = 'yes'), 0)
+        ) FROM patients) as stats,
+        (SELECT json_group_array(json_object('region', region, 'count', count))
+         FROM (SELECT region, COUNT(*) as count FROM patients GROUP BY region)) as regions
+'''
+
+_SQL_CHARGES_STATS = '''
+    SELECT 
+        COUNT(*) as total_charges,
+        AVG(charges) as avg_charges,
+        MIN(charges) as min_charges,
+        MAX(charges) as max_charges
+    FROM insurance_charges
+'''
 
 def get_db_connection():
-    """Create a database connection."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Get the database connection for the current request.
+    
+    The connection is opened on first use and cached on ``g`` so every
+    query in the request shares it; it is closed by ``close_db_connection``.
+    """
+    global _db_initialized
+    conn = getattr(g, '_db', None)
+    if conn is None:
+        # Autocommit: the dashboard only reads, so each query runs on its
+        # own WAL snapshot without the module's implicit BEGIN
+        conn = g._db = sqlite3.connect(DB_PATH, isolation_level=None,
+                                       check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if DB_PATH != ':memory:':
+            # Readers no longer block behind the quality-check writer
+            if not _db_initialized:
+                conn.execute('PRAGMA journal_mode=WAL')
+                _ensure_indexes(conn)
+                _db_initialized = True
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(f'PRAGMA {pragma}')
     return conn
 
-@app.route('/')
-def index():
-    """Render the dashboard homepage."""
-    conn = get_db_connection()
+def _ensure_indexes(conn):
+    """Create the dashboard's indexes on whichever tables exist."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    for table, statement in DASHBOARD_INDEXES:
+        if table in tables:
+            conn.execute(statement)
+
+@app.teardown_appcontext
+def close_db_connection(exception):
+    """Close the request's database connection, if one was opened."""
+    conn = g.pop('_db', None)
+    if conn is not None:
+        conn.close()
+
+def _db_version():
+    """Identify the current state of the database from its file mtimes.
+    
+    Under WAL, commits land in the ``-wal`` file until a checkpoint, so it
+    is stat'ed alongside the main file.
+    """
+    version = []
+    for path in (DB_PATH, DB_PATH + '-wal'):
+        try:
+            version.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+def _dir_version(path):
+    """Identify the current contents of a directory from its mtime."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _cached(name, version, compute):
+    """Reuse a dashboard value until its source changes or it expires.
     
-    # Get table statistics
-    cursor = conn.execute('''
-        SELECT 'patients' as table_name, COUNT(*) as count FROM patients
-        UNION ALL
-        SELECT 'insurance_charges', COUNT(*) FROM insurance_charges
-    ''')
-    table_counts = {row['table_name']: row['count'] for row in cursor.fetchall()}
+    Args:
+        name (str): Cache slot for the value
+        version: Hashable state of the value's source
+        compute (callable): Builds the value on a miss
+        
+    Returns:
+        The cached or freshly computed value
+    """
+    now = time.monotonic()
+    cached = _dashboard_cache.get(name)
+    if cached is not None and cached[0] == version and cached[1] > now:
+        return cached[2]
     
-    # Get recent quality check results
-    recent_results = []
-    quality_results_dir = 'data/quality_results'
-    if os.path.exists(quality_results_dir):
-        for filename in sorted(os.listdir(quality_results_dir), reverse=True)[:5]:
-            if filename.endswith('.json'):
-                with open(os.path.join(quality_results_dir, filename)) as f:
-                    result = json.load(f)
-                    result['filename'] = filename
-                    result['issue_count'] = len(result.get('issues', []))
-                    recent_results.append(result)
+    value = compute()
+    _dashboard_cache[name] = (version, now + DASHBOARD_CACHE_TTL, value)
+    return value
+
+def _table_counts():
+    """Get the row count of each dashboard table."""
+    # Plain tuples unpack straight into the dict without name lookups
+    cursor = get_db_connection().cursor()
+    cursor.row_factory = None
+    return dict(cursor.execute(_SQL_TABLE_COUNTS).fetchall())
+
+def _table_info():
+    """Get the row and column counts of each dashboard table."""
+    cursor = get_db_connection().execute(_SQL_TABLE_INFO)
+    return [dict(row) for row in cursor.fetchall()]
+
+def _result_entries():
+    """List the quality result files as directory entries."""
+    if not os.path.exists(QUALITY_RESULTS_DIR):
+        return []
+    with os.scandir(QUALITY_RESULTS_DIR) as entries:
+        return [entry for entry in entries if entry.name.endswith('.json')]
+
+def _load_summary(entry):
+    """Summarize a quality result file, reparsing it only if it has changed.
+    
+    Only the listing fields are kept, so the issues arrays are released as
+    soon as they have been counted.
+    
+    Args:
+        entry (os.DirEntry): Result file entry from ``_result_entries``
+        
+    Returns:
+        dict: The result's ``RESULT_SUMMARY_FIELDS`` that are present, plus
+            ``filename`` and ``issue_count``
+    """
+    mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+    cached = _result_cache.get(entry.name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(entry.path, 'rb') as f:
+        result = orjson.loads(f.read())
+    # Absent fields stay absent so the templates render them as before
+    summary = {field: result[field] for field in RESULT_SUMMARY_FIELDS if field in result}
+    summary['filename'] = entry.name
+    summary['issue_count'] = len(result.get('issues', []))
+    _result_cache[entry.name] = (mtime, summary)
+    return summary
+
+def _recent_results(n=5):
+    """Summarize the ``n`` most recent quality check results."""
+    # Filenames start with the run timestamp, so the largest are the newest
+    newest = heapq.nlargest(n, _result_entries(), key=lambda entry: entry.name)
+    return [_load_summary(entry) for entry in newest]
+
+@app.route('/')
+async def index():
+    """Render the dashboard homepage."""
+    # Counts and result listings are reused until the database or the
+    # results directory is written to. The two are independent, so a cold
+    # query and a cold directory scan run side by side in worker threads.
+    table_counts, recent_results = await asyncio.gather(
+        asyncio.to_thread(_cached, 'table_counts', _db_version(), _table_counts),
+        asyncio.to_thread(_cached, 'recent_results', _dir_version(QUALITY_RESULTS_DIR),
+                          _recent_results)
+    )
     
-    conn.close()
     return render_template('index.html', 
                          table_counts=table_counts,
                          recent_results=recent_results)
@@ -55,34 +252,7 @@ def index():
 @app.route('/tables')
 def tables():
     """Render the tables overview page."""
-    conn = get_db_connection()
-    
-    # Get table information
-    tables = []
-    
-    # Patients table info
-    cursor = conn.execute('SELECT COUNT(*) as count FROM patients')
-    patient_count = cursor.fetchone()['count']
-    cursor = conn.execute('PRAGMA table_info(patients)')
-    patient_columns = len(cursor.fetchall())
-    tables.append({
-        'name': 'patients',
-        'count': patient_count,
-        'columns': patient_columns
-    })
-    
-    # Insurance charges table info
-    cursor = conn.execute('SELECT COUNT(*) as count FROM insurance_charges')
-    charges_count = cursor.fetchone()['count']
-    cursor = conn.execute('PRAGMA table_info(insurance_charges)')
-    charges_columns = len(cursor.fetchall())
-    tables.append({
-        'name': 'insurance_charges',
-        'count': charges_count,
-        'columns': charges_columns
-    })
-    
-    conn.close()
+    tables = _cached('table_info', _db_version(), _table_info)
     return render_template('tables.html', tables=tables)
 
 @app.route('/table/<table_name>')
@@ -91,25 +261,10 @@ def table_detail(table_name):
     conn = get_db_connection()
     
     if table_name == 'patients':
-        # Get patient statistics
-        cursor = conn.execute('''
-            SELECT 
-                COUNT(*) as total_patients,
-                AVG(age) as avg_age,
-                AVG(bmi) as avg_bmi,
-                SUM(children) as total_children,
-                COUNT(CASE WHEN smoker = 'yes' THEN 1 END) as smoker_count
-            FROM patients
-        ''')
-        stats = cursor.fetchone()
-        
-        # Get region distribution
-        cursor = conn.execute('''
-            SELECT region, COUNT(*) as count
-            FROM patients
-            GROUP BY region
-        ''')
-        regions = cursor.fetchall()
+        # Get patient statistics and region distribution
+        row = conn.execute(_SQL_PATIENT_STATS).fetchone()
+        stats = orjson.loads(row['stats'])
+        regions = orjson.loads(row['regions'])
         
         return render_template('table_detail.html',
                              table_name=table_name,
@@ -118,38 +273,21 @@ def table_detail(table_name):
     
     elif table_name == 'insurance_charges':
         # Get charges statistics
-        cursor = conn.execute('''
-            SELECT 
-                COUNT(*) as total_charges,
-                AVG(charges) as avg_charges,
-                MIN(charges) as min_charges,
-                MAX(charges) as max_charges
-            FROM insurance_charges
-        ''')
+        cursor = conn.execute(_SQL_CHARGES_STATS)
         stats = cursor.fetchone()
         
         return render_template('table_detail.html',
                              table_name=table_name,
                              stats=stats)
     
-    conn.close()
     flash('Invalid table name', 'danger')
     return redirect(url_for('tables'))
 
 @app.route('/quality')
 def quality():
     """Render the quality checks page."""
-    quality_results = []
-    quality_results_dir = 'data/quality_results'
-    
-    if os.path.exists(quality_results_dir):
-        for filename in sorted(os.listdir(quality_results_dir), reverse=True):
-            if filename.endswith('.json'):
-                with open(os.path.join(quality_results_dir, filename)) as f:
-                    result = json.load(f)
-                    result['filename'] = filename
-                    result['issue_count'] = len(result.get('issues', []))
-                    quality_results.append(result)
+    entries = sorted(_result_entries(), key=lambda entry: entry.name, reverse=True)
+    quality_results = [_load_summary(entry) for entry in entries]
     
     return render_template('quality.html', quality_results=quality_results)
 
@@ -177,8 +315,8 @@ def run_quality_check():
 def quality_result(filename):
     """Render a specific quality check result."""
     try:
-        with open(os.path.join('data/quality_results', filename)) as f:
-            result = json.load(f)
+        with open(os.path.join(QUALITY_RESULTS_DIR, filename), 'rb') as f:
+            result = orjson.loads(f.read())
             return render_template('quality_result.html', result=result)
     except:
         flash('Quality check result not found', 'danger')
@@ -206,9 +344,8 @@ if __name__ == '__main__':
     os.makedirs('src/web/templates', exist_ok=True)
     os.makedirs('src/web/static', exist_ok=True)
     
-    # Get host and port from environment
-    host = os.getenv('WEB_HOST', 'localhost')
-    port = int(os.getenv('WEB_PORT', 5001))
-    debug = os.getenv('DEBUG', 'True').lower() in ('true', '1', 't')
+    # Compile the quality check kernels now rather than on the first run
+    from src.data_quality import warm_up
+    warm_up()
     
-    app.run(host=host, port=port, debug=debug)
+    app.run(host=config.web_host, port=config.web_port, debug=config.debug)
@@ -11,7 +11,7 @@ Author: Robert Torres
 """
 
 import os
-import json
+import orjson
 import pandas as pd
 import numpy as np
 import streamlit as st
@@ -19,7 +19,6 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
 from pathlib import Path
 
 # Import our validation framework
@@ -29,13 +28,18 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.ml.healthcare_validator import HealthcareModelValidator
 
+# Layout of the metrics trend figure, built once rather than on every rerun
+TREND_LAYOUT = go.Layout(title='Data Quality Metrics Over Time',
+                         xaxis_title='Timestamp',
+                         yaxis_title='Metric Value')
+
 def load_config():
     """Load configuration from file."""
     config_path = "config.json"
     try:
         if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            with open(config_path, 'rb') as f:
+                return orjson.loads(f.read())
         else:
             st.warning(f"Config file {config_path} not found. Using default configuration.")
             return {
@@ -52,30 +56,46 @@ def load_validation_results():
     config = load_config()
     reports_dir = Path(config.get("reports_dir", "validation_results"))
     
+    # Names and mtimes are cheap to stat and change whenever a report is
+    # added, rewritten or removed, so they key the parsed results
+    fingerprint = tuple(sorted((file.name, file.stat().st_mtime_ns)
+                               for file in reports_dir.glob("*.json")))
+    return _load_validation_results(str(reports_dir), fingerprint)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_validation_results(reports_dir, fingerprint):
+    """Parse the validation results in a directory.
+    
+    Args:
+        reports_dir: Directory containing the result JSON files
+        fingerprint: Name and mtime of each result file, so the cached
+            results are reloaded once any of them changes
+    """
     results = []
-    for file in reports_dir.glob("*.json"):
+    for file in Path(reports_dir).glob("*.json"):
         if file.name != "summary_report.md":
             try:
-                with open(file, 'r') as f:
+                with open(file, 'rb') as f:
                     content = f.read()
                     # Skip empty or invalid files
                     if not content.strip():
                         st.warning(f"Empty file: {file}")
                         continue
-                    result = json.loads(content)
+                    result = orjson.loads(content)
                     # Verify required fields are present
                     if all(k in result for k in ['model_name', 'model_version', 'timestamp', 'metrics']):
                         result['filename'] = file.name
                         results.append(result)
                     else:
                         st.warning(f"Missing required fields in {file}")
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 st.warning(f"Invalid JSON in {file}: {str(e)}")
             except Exception as e:
                 st.error(f"Error loading {file}: {str(e)}")
     
     return sorted(results, key=lambda x: x.get('timestamp', ''), reverse=True)
 
+@st.cache_data(ttl=300, show_spinner=False)
 def load_latest_data():
     """Load the latest healthcare dataset."""
     try:
@@ -91,32 +111,25 @@ def plot_data_quality_trends(results):
         st.warning("No validation results available")
         return
     
-    # Extract metrics over time
-    metrics_data = []
-    for result in results:
-        metrics = result.get('metrics', {})
-        timestamp = datetime.fromisoformat(result.get('timestamp', ''))
-        metrics_data.append({
-            'timestamp': timestamp,
-            'r2_score': metrics.get('r2', 0),
-            'mse': metrics.get('mse', 0),
-            'mae': metrics.get('mae', 0)
-        })
+    # Extract metrics over time; reports missing a metric plot it as 0
+    df_metrics = (pd.json_normalize(results, max_level=1)
+                  .reindex(columns=['timestamp', 'metrics.r2', 'metrics.mse', 'metrics.mae'])
+                  .rename(columns={'metrics.r2': 'r2_score', 'metrics.mse': 'mse',
+                                   'metrics.mae': 'mae'}))
+    df_metrics[['r2_score', 'mse', 'mae']] = df_metrics[['r2_score', 'mse', 'mae']].fillna(0)
+    df_metrics['timestamp'] = pd.to_datetime(df_metrics['timestamp'], format='ISO8601')
     
-    df_metrics = pd.DataFrame(metrics_data)
-    
-    # Plot metrics trends
-    fig = go.Figure()
+    st.plotly_chart(_trend_figure(df_metrics))
+
+@st.cache_data(show_spinner=False)
+def _trend_figure(df_metrics):
+    """Build the metrics trend figure, reused while the metrics are unchanged."""
+    fig = go.Figure(layout=TREND_LAYOUT)
     fig.add_trace(go.Scatter(x=df_metrics['timestamp'], y=df_metrics['r2_score'],
                             mode='lines+markers', name='R² Score'))
     fig.add_trace(go.Scatter(x=df_metrics['timestamp'], y=df_metrics['mae']/df_metrics['mae'].max(),
                             mode='lines+markers', name='MAE (normalized)'))
-    
-    fig.update_layout(title='Data Quality Metrics Over Time',
-                     xaxis_title='Timestamp',
-                     yaxis_title='Metric Value')
-    
-    st.plotly_chart(fig)
+    return fig
 
 def plot_bias_analysis(results):
     """Plot bias analysis results."""
@@ -127,18 +140,15 @@ def plot_bias_analysis(results):
     bias_analysis = latest_result.get('healthcare_bias', {})
     protected_attrs = bias_analysis.get('protected_attributes', {})
     
-    # Create bias metrics visualization
-    bias_data = []
-    for attr, metrics in protected_attrs.items():
-        for group, values in metrics.get('groups', {}).items():
-            bias_data.append({
-                'attribute': attr,
-                'group': group,
-                'mean_prediction': values.get('mean_prediction', 0),
-                'prediction_rate': values.get('prediction_rate', 0)
-            })
-    
-    df_bias = pd.DataFrame(bias_data)
+    # Create bias metrics visualization, one row per (attribute, group)
+    groups = {(attr, group): values
+              for attr, metrics in protected_attrs.items()
+              for group, values in metrics.get('groups', {}).items()}
+    df_bias = (pd.DataFrame.from_dict(groups, orient='index')
+               .reindex(columns=['mean_prediction', 'prediction_rate'])
+               .fillna(0))
+    df_bias.index = pd.MultiIndex.from_tuples(df_bias.index, names=['attribute', 'group'])
+    df_bias = df_bias.reset_index()
     
     # Plot bias metrics
     fig = px.bar(df_bias, x='group', y='mean_prediction', color='attribute',
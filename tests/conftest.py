@@ -17,6 +17,7 @@ import pytest
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from datetime import datetime
 import tempfile
@@ -32,6 +33,21 @@ TEST_DB_PATH = Path("tests/data/test_healthcare.db")
 TEST_CONFIG_PATH = Path("tests/data/test_config.json")
 API_BASE_URL = "http://localhost:5001"
 
+# Connection settings matching the dashboard's, so tests exercise WAL
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-20000",
+    "mmap_size=268435456"
+)
+
+def tune_connection(conn):
+    """Apply the dashboard's SQLite PRAGMAs to a test connection."""
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    return conn
+
 @pytest.fixture(scope="session")
 def test_config():
     """Create test configuration."""
@@ -74,13 +90,19 @@ def test_data():
         "charges": [16884.92, 1725.55, 4449.46, 21984.47, 3866.86]
     })
 
+@pytest.fixture(scope="session")
+def numeric_cols(test_data):
+    """List the numeric columns of the sample data, which never changes schema."""
+    return [column for column, dtype in test_data.dtypes.items()
+            if np.issubdtype(dtype, np.number)]
+
 @pytest.fixture(scope="session")
 def test_db(test_config, test_data):
     """Create test database with sample data."""
     if TEST_DB_PATH.exists():
         TEST_DB_PATH.unlink()
     
-    conn = sqlite3.connect(TEST_DB_PATH)
+    conn = tune_connection(sqlite3.connect(TEST_DB_PATH))
     
     # Create tables
     conn.execute('''
@@ -108,9 +130,14 @@ def test_db(test_config, test_data):
     )
     ''')
     
-    # Insert test data
-    test_data.to_sql("insurance_data", conn, if_exists="replace", index=False)
-    
+    # Insert test data in a single transaction
+    rows = list(test_data.itertuples(index=False, name=None))
+    conn.execute("BEGIN IMMEDIATE")
+    conn.executemany(
+        "INSERT INTO insurance_data (age, sex, bmi, children, smoker, region, charges) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows
+    )
     conn.commit()
     conn.close()
     
@@ -122,7 +149,7 @@ def temp_db():
     temp_dir = tempfile.mkdtemp()
     temp_db_path = Path(temp_dir) / "temp_test.db"
     
-    conn = sqlite3.connect(temp_db_path)
+    conn = tune_connection(sqlite3.connect(temp_db_path))
     conn.execute('''
     CREATE TABLE IF NOT EXISTS insurance_data (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -149,18 +176,25 @@ def api_client():
     class APIClient:
         def __init__(self, base_url):
             self.base_url = base_url
+            # One keep-alive session for the whole run, so calls reuse
+            # pooled connections instead of reconnecting every time
+            self.session = requests.Session()
+            self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            self.session.headers["Connection"] = "keep-alive"
         
         def get(self, endpoint, params=None):
-            return requests.get(f"{self.base_url}{endpoint}", params=params)
+            return self.session.get(f"{self.base_url}{endpoint}", params=params)
         
         def post(self, endpoint, json_data=None):
-            return requests.post(f"{self.base_url}{endpoint}", json=json_data)
+            return self.session.post(f"{self.base_url}{endpoint}", json=json_data)
     
-    return APIClient(API_BASE_URL)
+    client = APIClient(API_BASE_URL)
+    yield client
+    client.session.close()
 
-@pytest.fixture(scope="function")
-def selenium_driver():
-    """Create Selenium WebDriver for UI testing."""
+@pytest.fixture(scope="session")
+def chrome_driver():
+    """Launch one headless Chrome for the whole test session."""
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
@@ -172,6 +206,9 @@ def selenium_driver():
     chrome_options.add_argument("--headless")  # Run in headless mode
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    # Return once the DOM is ready; tests wait explicitly for what they need
+    chrome_options.page_load_strategy = "eager"
     
     try:
         # Let Selenium handle driver installation and configuration
@@ -179,4 +216,11 @@ def selenium_driver():
         yield driver
     finally:
         if 'driver' in locals():
-            driver.quit()
\ No newline at end of file
+            driver.quit()
+
+@pytest.fixture(scope="function")
+def selenium_driver(chrome_driver):
+    """Provide the shared WebDriver, reset to a blank page with no cookies."""
+    chrome_driver.delete_all_cookies()
+    chrome_driver.get("about:blank")
+    yield chrome_driver
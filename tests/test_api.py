@@ -12,6 +12,7 @@ Author: Robert Torres
 
 import pytest
 import json
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
@@ -172,9 +173,11 @@ class TestAPIEndpoints:
     
     def test_large_data_handling(self, api_client, test_data):
         """Test handling of large data uploads."""
-        # Create large dataset
-        large_data = pd.concat([test_data] * 1000, ignore_index=True)
-        data_json = large_data.to_json(orient="records")
+        # Create large dataset by tiling each column in one allocation
+        large_data = pd.DataFrame({
+            column: np.tile(test_data[column].to_numpy(), 1000)
+            for column in test_data.columns
+        })
         
         # Test chunked upload
         chunk_size = 1000
@@ -188,7 +191,7 @@ class TestAPIEndpoints:
             response = api_client.post(
                 "/data/upload/chunk",
                 json_data={
-                    "data": chunk.to_json(orient="records"),
+                    "data": chunk.to_dict(orient="records"),
                     "chunk_number": i + 1,
                     "total_chunks": total_chunks
                 }
@@ -0,0 +1,235 @@
+"""
+Unit tests for the API server, run through Flask's test client.
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import orjson
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import src.api.app as api_app
+from src.data_quality import warm_up
+
+# Rows in the sample table; more than one fetchmany() chunk
+SAMPLE_ROWS = 2500
+
+
+class APIAppTests(unittest.TestCase):
+    """Test the API endpoints against a temporary database."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a sample database and results directory for the app."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.db_path = os.path.join(cls.temp_dir, 'healthcare.db')
+        cls.results_dir = os.path.join(cls.temp_dir, 'quality_results')
+        os.makedirs(cls.results_dir)
+
+        conn = sqlite3.connect(cls.db_path)
+        conn.execute('CREATE TABLE patients (id INTEGER PRIMARY KEY, age INTEGER, bmi REAL, region TEXT)')
+        conn.executemany(
+            'INSERT INTO patients (age, bmi, region) VALUES (?, ?, ?)',
+            [(18 + i % 60, 20.0 + i % 15, 'southwest') for i in range(SAMPLE_ROWS)]
+        )
+        conn.execute('CREATE TABLE insurance_charges (id INTEGER PRIMARY KEY, patient_id INTEGER, charges REAL)')
+        # Every tenth region is missing and one BMI is far off the rest
+        conn.execute("UPDATE patients SET region = NULL WHERE id % 10 = 0")
+        conn.execute("UPDATE patients SET bmi = 500.0 WHERE id = 5")
+        conn.commit()
+        conn.close()
+
+        cls._saved = (api_app.DB_PATH, api_app.QUALITY_RESULTS_DIR)
+        api_app.DB_PATH = cls.db_path
+        api_app.QUALITY_RESULTS_DIR = cls.results_dir
+        api_app.app.testing = True
+        # The check endpoints run kernels on worker threads; compile them on
+        # the main thread first, as the servers do at startup
+        warm_up()
+        cls.client = api_app.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the app settings and remove the temporary files."""
+        api_app.DB_PATH, api_app.QUALITY_RESULTS_DIR = cls._saved
+        shutil.rmtree(cls.temp_dir)
+
+    def setUp(self):
+        """Start each test with empty module-level caches."""
+        api_app._known_tables = frozenset()
+        api_app._count_cache.clear()
+        api_app._results_index.clear()
+        api_app._results_mtimes.clear()
+
+    def test_01_table_data_streams_rows(self):
+        """Test that table data is streamed as one JSON document."""
+        response = self.client.get(f'/api/tables/patients/data?limit={SAMPLE_ROWS}')
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.is_streamed)
+
+        body = orjson.loads(response.data)
+        self.assertEqual(SAMPLE_ROWS, body['meta']['total'])
+        self.assertEqual(SAMPLE_ROWS, len(body['data']))
+        self.assertEqual({'id': 1, 'age': 18, 'bmi': 20.0, 'region': 'southwest'}, body['data'][0])
+
+        # Offsets still page through the rows
+        body = orjson.loads(self.client.get('/api/tables/patients/data?limit=2&offset=10').data)
+        self.assertEqual([11, 12], [row['id'] for row in body['data']])
+
+    def test_02_connection_closed_on_teardown(self):
+        """Test that a request shares one connection, closed at teardown."""
+        with api_app.app.app_context():
+            db = api_app.get_db()
+            self.assertIs(db, api_app.get_db())
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            db.execute('SELECT 1')
+
+    def test_03_table_allowlist_cached(self):
+        """Test that known tables skip the catalog and unknown ones reload it."""
+        self.assertEqual(200, self.client.get('/api/tables/patients').status_code)
+        self.assertIn('patients', api_app._known_tables)
+
+        # A known name is served from the cached allowlist as it is
+        api_app._known_tables = api_app._known_tables | {'stale_table'}
+        self.assertEqual(200, self.client.get('/api/tables/patients').status_code)
+        self.assertIn('stale_table', api_app._known_tables)
+
+        # An unknown name reloads the allowlist before being rejected
+        response = self.client.get('/api/tables/missing')
+        self.assertEqual(400, response.status_code)
+        self.assertIn('error', orjson.loads(response.data))
+        self.assertNotIn('stale_table', api_app._known_tables)
+
+    def test_04_results_indexed_by_mtime(self):
+        """Test that result files are only reparsed when their mtime changes."""
+        path = os.path.join(self.results_dir, 'null_check.json')
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps({'check_name': 'Null Value Check', 'status': 'passed', 'issues': []}))
+
+        results = orjson.loads(self.client.get('/api/quality/results').data)['results']
+        self.assertEqual(['passed'], [result['status'] for result in results])
+
+        # Rewriting the file under the same mtime keeps the indexed summary
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps({'check_name': 'Null Value Check', 'status': 'failed', 'issues': [{}]}))
+        os.utime(path, ns=(mtime, mtime))
+        results = orjson.loads(self.client.get('/api/quality/results').data)['results']
+        self.assertEqual(['passed'], [result['status'] for result in results])
+
+        # A new mtime gets the file parsed again
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+        results = orjson.loads(self.client.get('/api/quality/results').data)['results']
+        self.assertEqual([('failed', 1)], [(r['status'], r['issue_count']) for r in results])
+
+        # Removed files drop out of the index
+        os.remove(path)
+        results = orjson.loads(self.client.get('/api/quality/results').data)['results']
+        self.assertEqual([], results)
+        self.assertEqual({}, api_app._results_index)
+
+    def post_json(self, endpoint, payload):
+        """POST a JSON payload and return the status code and decoded body."""
+        response = self.client.post(endpoint, json=payload)
+        return response.status_code, orjson.loads(response.data)
+
+    def test_05_null_check_endpoint(self):
+        """Test the null check on columns read from the database."""
+        status, results = self.post_json('/api/quality/null-check',
+                                         {'table': 'patients', 'columns': ['age', 'region']})
+
+        self.assertEqual(200, status)
+        self.assertEqual({'age': 0, 'region': SAMPLE_ROWS // 10}, results['null_counts'])
+        self.assertTrue(results['passed'])
+
+        status, _ = self.post_json('/api/quality/null-check',
+                                   {'table': 'patients', 'columns': ['weight']})
+        self.assertEqual(400, status)
+        status, _ = self.post_json('/api/quality/null-check', {'table': 'missing', 'columns': ['age']})
+        self.assertEqual(400, status)
+
+    def test_06_schema_check_endpoint(self):
+        """Test the schema check against the table's loaded dtypes."""
+        schema = {'patients': {
+            'id': {'type': 'INTEGER', 'primary_key': True},
+            'age': {'type': 'INTEGER', 'nullable': False},
+            'bmi': {'type': 'REAL'},
+            'region': {'type': 'TEXT'}
+        }}
+        status, results = self.post_json('/api/quality/schema-check', {'schema': schema})
+
+        self.assertEqual(200, status)
+        self.assertTrue(results['patients']['schema_valid'])
+        self.assertEqual({'age', 'id'}, set(results['patients']['required_columns']))
+
+        schema['patients']['bmi'] = {'type': 'TEXT'}
+        status, results = self.post_json('/api/quality/schema-check', {'schema': schema})
+        self.assertEqual(200, status)
+        self.assertIn('bmi', results['patients']['type_violations'])
+
+    def test_07_anomaly_check_endpoint(self):
+        """Test the anomaly check on one column read from the database."""
+        status, results = self.post_json('/api/quality/anomaly-check',
+                                         {'table': 'patients', 'column': 'bmi', 'threshold': 3.5})
+
+        self.assertEqual(200, status)
+        self.assertEqual(['bmi'], results['columns_checked'])
+        self.assertEqual([4], results['anomalies']['bmi']['indices'])
+
+        status, _ = self.post_json('/api/quality/anomaly-check',
+                                   {'table': 'patients', 'column': 'bmi', 'method': 'iqr'})
+        self.assertEqual(400, status)
+
+    def test_08_indexes_built_on_first_connection(self):
+        """Test that the first connection builds the checks' indexes."""
+        api_app._indexes_ensured = False
+        self.assertEqual(200, self.client.get('/api/tables').status_code)
+        self.assertTrue(api_app._indexes_ensured)
+
+        conn = sqlite3.connect(self.db_path)
+        names = {row[0] for row in conn.execute('SELECT name FROM sqlite_master')}
+        conn.close()
+        self.assertIn('ix_ic_patient_id', names)
+        self.assertIn('sqlite_stat1', names)
+
+    def get_page(self, query):
+        """GET a page of patients and return its decoded body."""
+        response = self.client.get(f'/api/tables/patients/data?{query}')
+        self.assertEqual(200, response.status_code)
+        return orjson.loads(response.data)
+
+    def test_09_keyset_pagination(self):
+        """Test paging through a table with after_id."""
+        page = self.get_page('after_id=0&limit=1000')
+        self.assertEqual(list(range(1, 1001)), [row['id'] for row in page['data']])
+        self.assertEqual(0, page['meta']['after_id'])
+        self.assertEqual(1000, page['next_after_id'])
+
+        page = self.get_page(f"after_id={page['next_after_id']}&limit=1000")
+        self.assertEqual(list(range(1001, 2001)), [row['id'] for row in page['data']])
+        self.assertEqual(2000, page['next_after_id'])
+
+        # The last page, even when exactly full, has no following page
+        page = self.get_page(f"after_id={page['next_after_id']}&limit={SAMPLE_ROWS - 2000}")
+        self.assertEqual(list(range(2001, SAMPLE_ROWS + 1)), [row['id'] for row in page['data']])
+        self.assertIsNone(page['next_after_id'])
+
+        page = self.get_page(f'after_id={SAMPLE_ROWS}')
+        self.assertEqual([], page['data'])
+        self.assertIsNone(page['next_after_id'])
+
+    def test_10_keyset_pagination_rejects_bad_after_id(self):
+        """Test that a non-integer after_id is rejected, not ignored."""
+        response = self.client.get('/api/tables/patients/data?after_id=abc')
+        self.assertEqual(400, response.status_code)
+        self.assertIn('error', orjson.loads(response.data))
+
+if __name__ == "__main__":
+    unittest.main()
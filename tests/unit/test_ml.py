@@ -14,12 +14,11 @@ from src.ml import HealthcareTextAnalyzer
 class MLTests(unittest.TestCase):
     """Test the ML components."""
     
-    def setUp(self):
-        """Set up the test case."""
-        self.analyzer = HealthcareTextAnalyzer()
-        
+    @classmethod
+    def setUpClass(cls):
+        """Train one analyzer shared, read-only, by the tests."""
         # Sample healthcare texts and labels for testing
-        self.texts = [
+        cls.texts = [
             "Patient presents with chest pain and shortness of breath. History of hypertension.",
             "Routine checkup. No complaints. Blood pressure normal.",
             "Severe abdominal pain. Patient reports nausea and vomiting for 2 days.",
@@ -32,7 +31,7 @@ class MLTests(unittest.TestCase):
             "Patient presents with rash on arms and torso. Itching reported."
         ]
         
-        self.labels = [
+        cls.labels = [
             "cardiac",
             "routine",
             "gastrointestinal",
@@ -44,29 +43,29 @@ class MLTests(unittest.TestCase):
             "obstetric",
             "dermatological"
         ]
+        
+        cls.analyzer = HealthcareTextAnalyzer()
+        cls.analyzer.train(cls.texts, cls.labels)
     
     def test_01_preprocess_text(self):
         """Test text preprocessing."""
         text = "Patient has a fever of 101.5F and a cough. Possible flu."
-        processed = self.analyzer.preprocess_text(text)
+        processed = HealthcareTextAnalyzer().preprocess_text(text)
+        tokens = set(processed.split())
         
         # Check that preprocessing removes numbers and special characters
         self.assertNotIn("101.5", processed)
         self.assertNotIn(".", processed)
         
         # Check that preprocessing converts to lowercase
-        self.assertNotIn("Patient", processed)
-        self.assertIn("patient", processed)
+        self.assertEqual(processed.lower(), processed)
+        self.assertIn("patient", tokens)
         
-        # Check that preprocessing removes stopwords
-        self.assertNotIn(" a ", processed)
-        self.assertNotIn(" has ", processed)
-        self.assertNotIn(" and ", processed)
+        # Check that preprocessing removes stopwords, wherever they occur
+        self.assertFalse({"a", "has", "and"} & tokens)
     
     def test_02_train_model(self):
         """Test model training."""
-        self.analyzer.train(self.texts, self.labels)
-        
         # Check that the model is trained
         self.assertIsNotNone(self.analyzer.pipeline)
         self.assertIsNotNone(self.analyzer.labels)
@@ -78,8 +77,6 @@ class MLTests(unittest.TestCase):
     
     def test_03_predict(self):
         """Test prediction."""
-        self.analyzer.train(self.texts, self.labels)
-        
         # Test prediction on a new text
         new_text = "Patient reports chest pain radiating to the left arm."
         predictions = self.analyzer.predict([new_text])
@@ -90,8 +87,6 @@ class MLTests(unittest.TestCase):
     
     def test_04_predict_proba(self):
         """Test probability prediction."""
-        self.analyzer.train(self.texts, self.labels)
-        
         # Test probability prediction on a new text
         new_text = "Patient reports chest pain radiating to the left arm."
         probas = self.analyzer.predict_proba([new_text])
@@ -106,8 +101,6 @@ class MLTests(unittest.TestCase):
     
     def test_05_extract_keywords(self):
         """Test keyword extraction."""
-        self.analyzer.train(self.texts, self.labels)
-        
         # Test keyword extraction on a text
         text = "Patient presents with chest pain and shortness of breath. History of hypertension."
         keywords = self.analyzer.extract_keywords(text, top_n=5)
@@ -117,5 +110,21 @@ class MLTests(unittest.TestCase):
         self.assertIsInstance(keywords[0], tuple)
         self.assertEqual(2, len(keywords[0]))  # (keyword, score)
 
+    def test_06_streaming_train(self):
+        """Test batch-by-batch training in streaming mode."""
+        analyzer = HealthcareTextAnalyzer(streaming=True)
+        analyzer.partial_train(self.texts[:5], self.labels[:5], classes=self.labels)
+        analyzer.partial_train(self.texts[5:], self.labels[5:])
+
+        # Check that predictions use the full label set
+        predictions = analyzer.predict(["Patient reports chest pain radiating to the left arm."])
+        self.assertIn(predictions[0], self.labels)
+
+        # Check that metrics need an evaluation set, since texts are not kept
+        with self.assertRaises(ValueError):
+            analyzer.get_metrics()
+        metrics = analyzer.get_metrics(self.texts, self.labels)
+        self.assertIn('accuracy', metrics)
+
 if __name__ == "__main__":
     unittest.main()
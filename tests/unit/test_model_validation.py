@@ -13,33 +13,40 @@ from src.ml.healthcare_validator import HealthcareModelValidator
 class TestModelValidation(unittest.TestCase):
     """Test cases for model validation framework."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.base_validator = ModelValidator("test_model", "1.0.0")
-        self.healthcare_validator = HealthcareModelValidator("healthcare_model", "1.0.0")
-        
-        # Create sample test data
-        np.random.seed(42)
-        self.sample_size = 1000
+    @classmethod
+    def setUpClass(cls):
+        """Generate the sample data once; tests only read it."""
+        rng = np.random.default_rng(42)
+        cls.sample_size = 1000
         
         # Generate synthetic predictions and ground truth
-        self.y_true = np.random.randint(0, 2, self.sample_size)
-        self.y_pred = np.random.randint(0, 2, self.sample_size)
-        self.y_prob = np.random.random(self.sample_size)
+        cls.y_true = rng.integers(0, 2, cls.sample_size)
+        cls.y_pred = rng.integers(0, 2, cls.sample_size)
+        cls.y_prob = rng.random(cls.sample_size)
         
         # Generate healthcare-specific test data
-        self.age_predictions = np.random.normal(45, 15, self.sample_size)  # Age predictions
-        self.bmi_predictions = np.random.normal(25, 5, self.sample_size)   # BMI predictions
-        self.cost_predictions = np.random.normal(13000, 5000, self.sample_size)  # Cost predictions
-        
-        # Create sample sensitive features
-        self.sensitive_features = pd.DataFrame({
-            'age_group': np.random.choice(['18-30', '31-50', '51+'], self.sample_size),
-            'sex': np.random.choice(['F', 'M'], self.sample_size),
-            'race': np.random.choice(['A', 'B', 'C'], self.sample_size),
-            'region': np.random.choice(['NE', 'NW', 'SE', 'SW'], self.sample_size)
+        cls.age_predictions = rng.normal(45, 15, cls.sample_size)  # Age predictions
+        cls.bmi_predictions = rng.normal(25, 5, cls.sample_size)   # BMI predictions
+        cls.cost_predictions = rng.normal(13000, 5000, cls.sample_size)  # Cost predictions
+        
+        # Shared between tests, so guard against in-place changes
+        for array in (cls.y_true, cls.y_pred, cls.y_prob, cls.age_predictions,
+                      cls.bmi_predictions, cls.cost_predictions):
+            array.setflags(write=False)
+        
+        # Create sample sensitive features as integer-coded categoricals
+        cls.sensitive_features = pd.DataFrame({
+            'age_group': pd.Categorical(rng.choice(['18-30', '31-50', '51+'], cls.sample_size)),
+            'sex': pd.Categorical(rng.choice(['F', 'M'], cls.sample_size)),
+            'race': pd.Categorical(rng.choice(['A', 'B', 'C'], cls.sample_size)),
+            'region': pd.Categorical(rng.choice(['NE', 'NW', 'SE', 'SW'], cls.sample_size))
         })
     
+    def setUp(self):
+        """Set up fresh validators for each test."""
+        self.base_validator = ModelValidator("test_model", "1.0.0")
+        self.healthcare_validator = HealthcareModelValidator("healthcare_model", "1.0.0")
+    
     def test_base_performance_validation(self):
         """Test basic model performance validation."""
         metrics = self.base_validator.validate_performance(
@@ -59,6 +66,24 @@ class TestModelValidation(unittest.TestCase):
         self.assertGreaterEqual(metrics['roc_auc'], 0)
         self.assertLessEqual(metrics['roc_auc'], 1)
     
+    def test_streaming_performance_validation(self):
+        """Test that batched updates match one-shot performance validation."""
+        expected = self.base_validator.validate_performance(self.y_true, self.y_pred)
+
+        for start in range(0, self.sample_size, 300):
+            self.base_validator.update(self.y_true[start:start + 300],
+                                       self.y_pred[start:start + 300])
+        metrics = self.base_validator.finalize()
+
+        self.assertEqual(expected, metrics)
+        with self.assertRaises(ValueError):
+            self.base_validator.finalize()
+
+    def test_empty_performance_validation(self):
+        """Test that empty labels are rejected with a clear error."""
+        with self.assertRaisesRegex(ValueError, "0 sample"):
+            self.base_validator.validate_performance(np.array([]), np.array([]))
+    
     def test_base_output_validation(self):
         """Test model output validation."""
         validation_results = self.base_validator.validate_outputs(
@@ -111,6 +136,22 @@ class TestModelValidation(unittest.TestCase):
         self.assertIn('healthcare_specific_checks', cost_results)
         self.assertIn('clinical_validity', cost_results)
     
+    def test_rule_edited_in_place(self):
+        """Test that editing a rule's range in place takes effect."""
+        outputs = np.array([20.0, 30.0, 45.0])
+        rule_check = lambda: self.healthcare_validator.validate_healthcare_outputs(
+            outputs, output_type='bmi_distribution'
+        )["healthcare_specific_checks"][0]
+        
+        self.assertTrue(rule_check()["passed"])
+        
+        # Same outputs, narrower range: neither the compiled rule nor the
+        # cached result of the first run may be reused
+        self.healthcare_validator.healthcare_rules["bmi_distribution"]["range"] = (10, 40)
+        result = rule_check()
+        self.assertFalse(result["passed"])
+        self.assertEqual(1, result["details"]["outliers_count"])
+    
     def test_healthcare_bias_analysis(self):
         """Test healthcare-specific bias analysis."""
         bias_results = self.healthcare_validator.analyze_healthcare_bias(
@@ -152,6 +193,16 @@ class TestModelValidation(unittest.TestCase):
         self.assertIn('clinically_valid', results)
         self.assertIn('warnings', results)
     
+    def test_clinical_validity_empty_outputs(self):
+        """Test that clinical validity accepts an empty array."""
+        results = self.healthcare_validator._check_clinical_validity(
+            np.array([]),
+            output_type='bmi',
+            metadata=None
+        )
+        
+        self.assertEqual({"clinically_valid": True, "warnings": []}, results)
+    
     def test_version_comparison(self):
         """Test model version comparison."""
         # Create results for two versions